@@ -4,20 +4,26 @@ AlphaForge API Server
 FastAPI backend for trading dashboard with database integration
 """
 
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import uvicorn
 from datetime import datetime, timedelta
+from collections import Counter
+from contextlib import asynccontextmanager
+from email.utils import formatdate
 from pathlib import Path
 import glob
-import json
-import io
-import csv
+import hashlib
+import orjson
 import asyncio
 import os
+import sys
+import time
 import logging
 
 # Setup logging
@@ -39,7 +45,30 @@ from database.signal_crud import SignalCRUD, AnalyticsCRUD
 from database.trade_calculator import TradeCalculator
 from database.journal_models import JournalEntry
 from database.journal_crud import JournalCRUD
+from utils.orjson_response import ORJSONResponse
+from utils.rejection_reports import rejection_csv_rows
 # import strategy_variables as config  # Not needed - all config from .env
+import requests
+
+# Optional signal-generation components - resolved once at startup, not per request
+try:
+    from oandapyV20 import API
+    from oandapyV20.endpoints.pricing import PricingInfo
+except ImportError:
+    API = PricingInfo = None
+    logger.warning("⚠️ oandapyV20 not installed - outcome checks disabled")
+
+try:
+    from day_trading_signal_generator import DayTradingSignalGenerator
+except ImportError:
+    DayTradingSignalGenerator = None
+    logger.warning("⚠️ day_trading_signal_generator not available - /api/signals/generate disabled")
+
+try:
+    from enhanced_strategy_integration import get_enhanced_strategy
+except ImportError as e:
+    get_enhanced_strategy = None
+    logger.warning(f"⚠️ Enhanced strategy not available: {e}")
 
 # Database setup - Read from environment
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./trading_signals.db")
@@ -48,8 +77,11 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./trading_signals.db")
 if DATABASE_URL.startswith('postgresql'):
     engine = create_engine(
         DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        pool_timeout=30,
+        pool_pre_ping=True,  # catches the occasional stale connection
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800"))
     )
 else:
     engine = create_engine(
@@ -62,19 +94,50 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="AlphaForge API", version="2.0.0")
+# create_all skips indexes on tables that already exist
+for index in TradingSignal.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
+
+
+async def warm_enhanced_strategy():
+    """Build the shared enhanced strategy at boot instead of on the first request"""
+    if get_enhanced_strategy is None:
+        return
+    try:
+        await asyncio.to_thread(get_enhanced_strategy)
+        logger.info("✅ Enhanced strategy initialized")
+    except Exception as e:
+        logger.warning(f"⚠️ Enhanced strategy warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup work: log which event loop is running and warm the strategy"""
+    logger.info(f"Event loop: {asyncio.get_running_loop().__class__.__name__}")
+    await warm_enhanced_strategy()
+    yield
+
+
+app = FastAPI(title="AlphaForge API", version="2.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
-# CORS middleware
+# CORS middleware - set CORS_ORIGINS (comma-separated) in production
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"]
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["content-type", "authorization"],
+    expose_headers=["*"],
+    max_age=86400  # let browsers cache preflight results for a day
 )
 
-# Database dependency
+# Compress larger JSON/CSV payloads (signal and journal lists, rejection reports).
+# Level 5 keeps most of the size win at a fraction of level 9's CPU cost.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Database dependency - every handler gets its session here so each request
+# checks out at most one pooled connection and always returns it
 def get_db():
     db = SessionLocal()
     try:
@@ -82,6 +145,28 @@ def get_db():
     finally:
         db.close()
 
+# Environment config doesn't change at runtime; read it once at startup
+OANDA_API_KEY = os.getenv('OANDA_API_KEY')
+OANDA_ACCOUNT_ID = os.getenv('OANDA_ACCOUNT_ID')
+OANDA_ENVIRONMENT = os.getenv('OANDA_ENVIRONMENT', 'practice')
+TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+GEMINI_CONFIGURED = bool(os.getenv('GEMINI_API_KEY'))
+OANDA_CONFIGURED = bool(OANDA_API_KEY)
+
+# Largest page the list endpoints will return; larger requests are clamped
+MAX_PAGE_SIZE = 200
+
+# Status query strings resolved with a plain dict lookup instead of SignalStatus[...]
+_STATUS_MAP = {s.name: s for s in SignalStatus}
+
+# /api/status is polled by the dashboard; reuse the last check for a few seconds
+STATUS_CACHE_TTL = 3.0
+_status_cache = {"ts": 0.0, "value": None}
+
+# Statuses counted as closed in the dashboard statistics
+CLOSED_STATUSES = (SignalStatus.CLOSED, SignalStatus.WON, SignalStatus.LOST, SignalStatus.EXPIRED)
+
 # Global state
 state = {
     "backend_status": "online",
@@ -135,6 +220,8 @@ class PriceData(BaseModel):
 
 
 # Routes
+# Handlers that only do blocking work (SQLAlchemy, OANDA REST) are plain `def`
+# so Starlette runs them in its threadpool instead of on the event loop.
 @app.get("/")
 async def root():
     return {"message": "AlphaForge API Server", "version": "1.0.0"}
@@ -142,44 +229,33 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {
+    return ORJSONResponse(content={
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "backend": state["backend_status"],
         "oanda": state["oanda_status"],
         "strategy": state["strategy_status"]
-    }
+    })
 
 
 @app.get("/api/status")
-async def get_status_api():
-    """Get system status"""
+def get_status_api(db: Session = Depends(get_db)):
+    """Get system status (cached for STATUS_CACHE_TTL seconds)"""
+    now = time.monotonic()
+    if _status_cache["value"] is not None and now - _status_cache["ts"] < STATUS_CACHE_TTL:
+        return ORJSONResponse(content=_status_cache["value"])
+    
     # Check database status
     try:
-        db = SessionLocal()
         db.execute(text("SELECT 1"))
-        db.close()
         state["database_status"] = "connected"
     except Exception as e:
         state["database_status"] = "disconnected"
     
-    # Check Gemini status
-    try:
-        import os
-        gemini_key = os.getenv('GEMINI_API_KEY')
-        state["gemini_status"] = "configured" if gemini_key else "not configured"
-    except:
-        state["gemini_status"] = "unknown"
-    
-    # Check OANDA status
-    try:
-        import os
-        oanda_key = os.getenv('OANDA_API_KEY')
-        state["oanda_status"] = "connected" if oanda_key else "disconnected"
-    except:
-        state["oanda_status"] = "disconnected"
+    state["gemini_status"] = "configured" if GEMINI_CONFIGURED else "not configured"
+    state["oanda_status"] = "connected" if OANDA_CONFIGURED else "disconnected"
     
-    return {
+    status = {
         "backend": state["backend_status"],
         "oanda": state["oanda_status"],
         "strategy": state["strategy_status"],
@@ -187,6 +263,9 @@ async def get_status_api():
         "database": state["database_status"],
         "timestamp": datetime.now().isoformat()
     }
+    _status_cache["ts"] = now
+    _status_cache["value"] = status
+    return ORJSONResponse(content=status)
 
 
 @app.get("/status")
@@ -199,107 +278,86 @@ async def get_status():
         "timestamp": datetime.now().isoformat()
     }
 
+def _signal_list_statistics(signal_dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Calculate list statistics server-side in a single pass over the rows"""
+    counts = Counter(s['status'] for s in signal_dicts)
+    winners = counts[SignalStatus.WON]
+    losers = counts[SignalStatus.LOST]
+    pending = counts[SignalStatus.PENDING]
+    
+    total_decided = winners + losers
+    win_rate = round((winners / total_decided * 100), 1) if total_decided > 0 else 0
+    
+    return {
+        "total": len(signal_dicts),
+        "active": counts[SignalStatus.ACTIVE] + pending,
+        "closed": sum(counts[status] for status in CLOSED_STATUSES),
+        "winners": winners,
+        "losers": losers,
+        "expired": counts[SignalStatus.EXPIRED],
+        "pending": pending,
+        "winRate": win_rate,
+        "totalPnL": sum(s.get('actual_pnl', 0) or 0 for s in signal_dicts)
+    }
+
 @app.get("/signals")
-async def get_signals(db: Session = Depends(get_db)):
+def get_signals(db: Session = Depends(get_db)):
     """Get recent trading signals with pre-calculated statistics"""
     try:
-        signals = SignalCRUD.get_all_signals(db, limit=100)
-        signal_dicts = [signal.to_dict() for signal in signals]
-        
-        # Calculate statistics server-side
-        winners = sum(1 for s in signal_dicts if s.get('status') == 'WON')
-        losers = sum(1 for s in signal_dicts if s.get('status') == 'LOST')
-        expired = sum(1 for s in signal_dicts if s.get('status') == 'EXPIRED')
-        pending = sum(1 for s in signal_dicts if s.get('status') == 'PENDING')
-        active = sum(1 for s in signal_dicts if s.get('status') == 'ACTIVE')
-        closed = sum(1 for s in signal_dicts if s.get('status') in ['CLOSED', 'WON', 'LOST', 'EXPIRED'])
+        signal_dicts = SignalCRUD.list_dicts(db, limit=100)
         
-        total_decided = winners + losers
-        win_rate = round((winners / total_decided * 100), 1) if total_decided > 0 else 0
-        
-        return {
+        return ORJSONResponse(content={
             "signals": signal_dicts,
-            "count": len(signals),
-            "statistics": {
-                "total": len(signals),
-                "active": active + pending,
-                "closed": closed,
-                "winners": winners,
-                "losers": losers,
-                "expired": expired,
-                "pending": pending,
-                "winRate": win_rate,
-                "totalPnL": sum(s.get('actual_pnl', 0) or 0 for s in signal_dicts)
-            }
-        }
+            "count": len(signal_dicts),
+            "statistics": _signal_list_statistics(signal_dicts)
+        })
     except Exception as e:
         print(f"Error fetching signals: {e}")
         return {"signals": [], "count": 0, "statistics": {"total": 0, "winners": 0, "losers": 0, "winRate": 0}}
 
 
 @app.get("/api/signals")
-async def get_api_signals(db: Session = Depends(get_db)):
-    """Get recent trading signals with pre-calculated statistics (API version)"""
+def get_api_signals(cursor: Optional[int] = None, limit: int = 100, db: Session = Depends(get_db)):
+    """
+    Get recent trading signals with pre-calculated statistics (API version).
+    Pass `next_cursor` from the previous response as `cursor` to get the next page.
+    """
     try:
-        signals = SignalCRUD.get_all_signals(db, limit=100)
-        signal_dicts = [signal.to_dict() for signal in signals]
-        
-        # Calculate statistics server-side
-        winners = sum(1 for s in signal_dicts if s.get('status') == 'WON')
-        losers = sum(1 for s in signal_dicts if s.get('status') == 'LOST')
-        expired = sum(1 for s in signal_dicts if s.get('status') == 'EXPIRED')
-        pending = sum(1 for s in signal_dicts if s.get('status') == 'PENDING')
-        active = sum(1 for s in signal_dicts if s.get('status') == 'ACTIVE')
-        closed = sum(1 for s in signal_dicts if s.get('status') in ['CLOSED', 'WON', 'LOST', 'EXPIRED'])
-        
-        total_decided = winners + losers
-        win_rate = round((winners / total_decided * 100), 1) if total_decided > 0 else 0
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        signal_dicts = SignalCRUD.list_dicts(db, limit=limit + 1, cursor=cursor)
+        next_cursor = signal_dicts[limit - 1]['id'] if len(signal_dicts) > limit else None
+        signal_dicts = signal_dicts[:limit]
         
-        return {
+        return ORJSONResponse(content={
             "signals": signal_dicts,
-            "count": len(signals),
-            "statistics": {
-                "total": len(signals),
-                "active": active + pending,
-                "closed": closed,
-                "winners": winners,
-                "losers": losers,
-                "expired": expired,
-                "pending": pending,
-                "winRate": win_rate,
-                "totalPnL": sum(s.get('actual_pnl', 0) or 0 for s in signal_dicts)
-            }
-        }
+            "count": len(signal_dicts),
+            "next_cursor": next_cursor,
+            "statistics": _signal_list_statistics(signal_dicts)
+        })
     except Exception as e:
         print(f"Error fetching signals: {e}")
         return {"signals": [], "count": 0, "statistics": {"total": 0, "winners": 0, "losers": 0, "winRate": 0}}
 
 
 @app.get("/api/signals/today")
-async def get_signals_today(db: Session = Depends(get_db)):
+def get_signals_today(db: Session = Depends(get_db)):
     """Get today's trading signals"""
     try:
         # Get signals from today
         today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        signals = SignalCRUD.get_all_signals(db, limit=500)
+        today_signals = SignalCRUD.list_dicts(db, limit=500, since=today_start)
         
-        # Filter for today's signals
-        today_signals = [
-            signal for signal in signals 
-            if signal.timestamp and signal.timestamp >= today_start
-        ]
-        
-        return {
-            "signals": [signal.to_dict() for signal in today_signals],
+        return ORJSONResponse(content={
+            "signals": today_signals,
             "count": len(today_signals)
-        }
+        })
     except Exception as e:
         print(f"Error fetching today's signals: {e}")
         return {"signals": [], "count": 0}
 
 
 @app.post("/api/signals/create")
-async def create_signal(signal_data: SignalCreate, db: Session = Depends(get_db)):
+def create_signal(signal_data: SignalCreate, db: Session = Depends(get_db)):
     """Create a new trading signal"""
     try:
         # Calculate risk:reward ratio
@@ -355,41 +413,38 @@ async def create_signal(signal_data: SignalCreate, db: Session = Depends(get_db)
 
 
 @app.get("/api/signals/statistics")
-async def get_signal_statistics(days: int = 30, db: Session = Depends(get_db)):
+def get_signal_statistics(days: int = 30, db: Session = Depends(get_db)):
     """Get signal generation statistics (NOT trade performance - use /api/journal/statistics for that)"""
     try:
         # Count signals only (no outcomes)
-        signals = SignalCRUD.get_all_signals(db, limit=1000)
-        total_signals = len(signals)
-        pending_signals = len([s for s in signals if s.status == SignalStatus.PENDING])
-        expired_signals = len([s for s in signals if s.status == SignalStatus.EXPIRED])
+        counts = SignalCRUD.count_by_status(db)
         
-        return {
-            "total_signals_generated": total_signals,
-            "pending_signals": pending_signals,
-            "expired_signals": expired_signals,
+        return ORJSONResponse(content={
+            "total_signals_generated": sum(counts.values()),
+            "pending_signals": counts.get(SignalStatus.PENDING, 0),
+            "expired_signals": counts.get(SignalStatus.EXPIRED, 0),
             "note": "For trade performance (win rate, PNL), see /api/journal/statistics"
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating statistics: {str(e)}")
 
 
 @app.get("/api/signals/symbol/{symbol}")
-async def get_signals_by_symbol(symbol: str, db: Session = Depends(get_db)):
+def get_signals_by_symbol(symbol: str, db: Session = Depends(get_db)):
     """Get signals for a specific symbol"""
     try:
-        signals = SignalCRUD.get_signals_by_symbol(db, symbol)
-        return {
+        signals = SignalCRUD.list_dicts(db, limit=None, symbol=symbol)
+        return ORJSONResponse(content={
             "symbol": symbol,
-            "signals": [signal.to_dict() for signal in signals],
+            "signals": signals,
             "count": len(signals)
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching signals: {str(e)}")
 
 
 @app.get("/api/signals/performance")
-async def get_symbol_performance(days: int = 30, db: Session = Depends(get_db)):
+def get_symbol_performance(days: int = 30, db: Session = Depends(get_db)):
     """Get performance by symbol"""
     try:
         performance = SignalCRUD.get_symbol_performance(db, days)
@@ -399,14 +454,14 @@ async def get_symbol_performance(days: int = 30, db: Session = Depends(get_db)):
 
 
 @app.put("/api/signals/{signal_id}/status")
-async def update_signal_status_endpoint(signal_id: int, status: str, exit_price: float = None, db: Session = Depends(get_db)):
+def update_signal_status_endpoint(signal_id: int, status: str, exit_price: float = None, db: Session = Depends(get_db)):
     """Update signal status (WON, LOST, EXPIRED, PENDING, ACTIVE, CLOSED)"""
-    valid_statuses = ['WON', 'LOST', 'EXPIRED', 'PENDING', 'ACTIVE', 'CLOSED', 'CANCELLED']
-    if status.upper() not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status: {status}. Valid: {valid_statuses}")
+    status_enum = _STATUS_MAP.get(status.upper())
+    if status_enum is None:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}. Valid: {list(_STATUS_MAP)}")
     
     try:
-        signal = SignalCRUD.update_signal_status(db, signal_id, SignalStatus[status.upper()])
+        signal = SignalCRUD.update_signal_status(db, signal_id, status_enum)
         if not signal:
             raise HTTPException(status_code=404, detail="Signal not found")
         
@@ -418,27 +473,22 @@ async def update_signal_status_endpoint(signal_id: int, status: str, exit_price:
             db.refresh(signal)
         
         return {"success": True, "signal": signal.to_dict()}
-    except KeyError:
-        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/signals/check-outcomes")
-async def check_signal_outcomes(db: Session = Depends(get_db)):
+def check_signal_outcomes(db: Session = Depends(get_db)):
     """
     Check PENDING signals against current prices and update status.
     - WON: If TP was hit
     - LOST: If SL was hit
     - EXPIRED: If signal is older than 4 hours with no TP/SL hit
     """
-    import os
-    from oandapyV20 import API
-    from oandapyV20.endpoints.pricing import PricingInfo
-    
-    OANDA_API_KEY = os.getenv("OANDA_API_KEY")
-    OANDA_ACCOUNT_ID = os.getenv("OANDA_ACCOUNT_ID")
-    OANDA_ENVIRONMENT = os.getenv("OANDA_ENVIRONMENT", "practice")
+    if API is None:
+        raise HTTPException(status_code=503, detail="oandapyV20 is not installed")
     
     SYMBOL_TO_INSTRUMENT = {
         'GBP/USD': 'GBP_USD',
@@ -468,7 +518,6 @@ async def check_signal_outcomes(db: Session = Depends(get_db)):
                 age = datetime.utcnow() - signal.timestamp
                 if age.total_seconds() > 4 * 3600:
                     signal.status = SignalStatus.EXPIRED
-                    db.commit()
                     results['expired'] += 1
                     results['details'].append({
                         'id': signal.id,
@@ -524,12 +573,14 @@ async def check_signal_outcomes(db: Session = Depends(get_db)):
                             signal.exit_time = datetime.utcnow()
                             results['lost'] += 1
                             results['details'].append({'id': signal.id, 'symbol': signal.symbol, 'status': 'LOST', 'exit_price': current_price})
-                    
-                    db.commit()
             except Exception as price_error:
                 print(f"Error fetching price for {signal.symbol}: {price_error}")
                 continue
         
+        # Commit once: committing per signal expires every loaded signal and
+        # forces a refresh SELECT for each remaining row on its next access
+        db.commit()
+        
         return {"success": True, "results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -592,13 +643,12 @@ async def stop_strategy():
 
 
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_db)):
     """Get trading statistics from JOURNAL (not signals)"""
     try:
-        from database.journal_crud import JournalCRUD
         stats = JournalCRUD.get_statistics(db)
         
-        return {
+        return ORJSONResponse(content={
             "total_trades": stats.get('total_trades', 0),
             "win_rate": stats.get('win_rate', 0.0),
             "profit_loss": stats.get('total_pnl', 0.0),
@@ -606,7 +656,7 @@ async def get_stats(db: Session = Depends(get_db)):
             "wins": stats.get('wins', 0),
             "losses": stats.get('losses', 0),
             "avg_r": stats.get('avg_r', 0.0)
-        }
+        })
     except Exception as e:
         logger.error(f"Error fetching stats: {e}")
         return {
@@ -620,14 +670,25 @@ async def get_stats(db: Session = Depends(get_db)):
         }
 
 
+def etag_response(request: Request, body: bytes) -> Response:
+    """Serve a pre-encoded JSON body with an ETag; 304 if the client's copy is current"""
+    etag = _ETAGS.get(body)
+    if etag is None:
+        etag = _ETAGS[body] = f'"{hashlib.sha1(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+_ETAGS: Dict[bytes, str] = {}
+_EMPTY_JOURNAL_JSON = orjson.dumps({"entries": [], "count": 0})
+
+
 @app.get("/api/journal")
-async def get_journal_entries():
+async def get_journal_entries(request: Request):
     """Get trading journal entries"""
     # Mock data for testing
-    return {
-        "entries": [],
-        "count": 0
-    }
+    return etag_response(request, _EMPTY_JOURNAL_JSON)
 
 
 # DEPRECATED: This endpoint used the old oanda_integration module  
@@ -715,63 +776,69 @@ async def get_journal_entries():
 #         return {"prices": mock_prices, "source": "mock"}
 
 
+# Mock quotes serialized once with the closing brace dropped, so each request
+# only appends its timestamp
+_MOCK_PRICES = {
+    "GBPUSD": {"bid": 1.2648, "ask": 1.2652, "price": 1.2650},
+    "XAUUSD": {"bid": 2735.50, "ask": 2736.50, "price": 2736.00},
+    "USDJPY": {"bid": 152.45, "ask": 152.47, "price": 152.46}
+}
+_MOCK_PRICE_PREFIXES = {
+    symbol: orjson.dumps({"symbol": symbol, **quote})[:-1]
+    for symbol, quote in _MOCK_PRICES.items()
+}
+_DEFAULT_MOCK_PRICE = {"bid": 1.0000, "ask": 1.0002, "price": 1.0001}
+
+
 @app.get("/api/prices/live/{symbol}")
 async def get_live_price(symbol: str):
     """Get live price for a specific symbol"""
-    mock_prices = {
-        "GBPUSD": {"bid": 1.2648, "ask": 1.2652, "price": 1.2650},
-        "XAUUSD": {"bid": 2735.50, "ask": 2736.50, "price": 2736.00},
-        "USDJPY": {"bid": 152.45, "ask": 152.47, "price": 152.46}
-    }
-    
     symbol_upper = symbol.upper().replace("_", "")
     
-    if symbol_upper in mock_prices:
-        return {
-            "symbol": symbol_upper,
-            **mock_prices[symbol_upper],
-            "timestamp": datetime.now().isoformat()
-        }
-    else:
-        return {
-            "symbol": symbol_upper,
-            "bid": 1.0000,
-            "ask": 1.0002,
-            "price": 1.0001,
-            "timestamp": datetime.now().isoformat()
-        }
+    prefix = _MOCK_PRICE_PREFIXES.get(symbol_upper)
+    if prefix is None:
+        prefix = orjson.dumps({"symbol": symbol_upper, **_DEFAULT_MOCK_PRICE})[:-1]
+    
+    body = prefix + b',"timestamp":"' + datetime.now().isoformat().encode() + b'"}'
+    return Response(content=body, media_type="application/json")
+
+
+_SYMBOLS_JSON = orjson.dumps({
+    "symbols": ["GBPUSD", "XAUUSD", "USDJPY", "EURUSD", "AUDUSD"],
+    "count": 5
+})
 
 
 @app.get("/api/symbols")
-async def get_symbols():
+async def get_symbols(request: Request):
     """Get available trading symbols"""
-    return {
-        "symbols": ["GBPUSD", "XAUUSD", "USDJPY", "EURUSD", "AUDUSD"],
-        "count": 5
-    }
+    return etag_response(request, _SYMBOLS_JSON)
 
 
 @app.post("/api/signals/generate")
 async def generate_signals(all_instruments: bool = True):
     """Generate trading signals using Day Trading Signal Generator (H1 timeframe, 1:2 RR)"""
+    if DayTradingSignalGenerator is None:
+        raise HTTPException(status_code=503, detail="Day trading signal generator is not available")
+    
     try:
-        from day_trading_signal_generator import DayTradingSignalGenerator
-        
         generator = DayTradingSignalGenerator()
         logger.info("📊 Using Day Trading Signal Generator (H1 timeframe, 1:2 RR)")
         
-        results = generator.run_single_scan()
+        # The scan does blocking OANDA/Gemini I/O; keep it off the event loop
+        results = await asyncio.to_thread(generator.run_single_scan)
         
         success_count = sum(1 for success in results.values() if success)
         
         # Convert results into list format
+        now_iso = datetime.now().isoformat()
         signals_list = []
         for instrument, success in results.items():
             if success:
                 signals_list.append({
                     "instrument": instrument,
                     "generated": success,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
         
         return {
@@ -788,15 +855,17 @@ async def generate_signals(all_instruments: bool = True):
 @app.post("/api/signals/generate/{instrument}")
 async def generate_signals_specific(instrument: str):
     """Generate day trading signal for a specific instrument (H1 timeframe, 1:2 RR)"""
+    if DayTradingSignalGenerator is None:
+        raise HTTPException(status_code=503, detail="Day trading signal generator is not available")
+    
     try:
         if not instrument or instrument.strip() == "":
             raise HTTPException(status_code=400, detail="Instrument cannot be empty")
         
-        from day_trading_signal_generator import DayTradingSignalGenerator
         generator = DayTradingSignalGenerator()
         logger.info(f"📊 Generating day trading signal for {instrument} (H1 timeframe)")
         
-        result = generator.process_instrument(instrument)
+        result = await asyncio.to_thread(generator.process_instrument, instrument)
         
         return {
             "status": "success" if result else "no_signals",
@@ -813,32 +882,27 @@ async def generate_signals_specific(instrument: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+_ANALYSIS_STATUS_JSON = orjson.dumps({"status": "idle", "last_analysis": None, "is_running": False})
+_ANALYSIS_LATEST_JSON = orjson.dumps({"analysis": None, "timestamp": None})
+_ANALYSIS_HISTORY_JSON = orjson.dumps({"history": [], "count": 0})
+
+
 @app.get("/api/analysis/status")
-async def get_analysis_status():
+async def get_analysis_status(request: Request):
     """Get analysis status"""
-    return {
-        "status": "idle",
-        "last_analysis": None,
-        "is_running": False
-    }
+    return etag_response(request, _ANALYSIS_STATUS_JSON)
 
 
 @app.get("/api/analysis/latest")
-async def get_latest_analysis():
+async def get_latest_analysis(request: Request):
     """Get latest analysis"""
-    return {
-        "analysis": None,
-        "timestamp": None
-    }
+    return etag_response(request, _ANALYSIS_LATEST_JSON)
 
 
 @app.get("/api/analysis/history")
-async def get_analysis_history():
+async def get_analysis_history(request: Request):
     """Get analysis history"""
-    return {
-        "history": [],
-        "count": 0
-    }
+    return etag_response(request, _ANALYSIS_HISTORY_JSON)
 
 
 # Backtesting endpoints removed - use standalone Python scripts instead
@@ -846,80 +910,149 @@ async def get_analysis_history():
 
 # ==================== ENHANCED SIGNAL GENERATION (AlphaForge Integration) ====================
 
+def _enhanced_strategy():
+    """Return the shared enhanced strategy, failing clearly if its module could not be imported"""
+    if get_enhanced_strategy is None:
+        raise RuntimeError("Enhanced strategy is not available")
+    return get_enhanced_strategy()
+
+
+# Blocking helpers for the async enhanced endpoints - called through
+# run_in_threadpool so DB and Telegram round trips stay off the event loop
+def _pairs_past_cooldown(db: Session, pairs: List[str], results: List[Dict[str, Any]]) -> List[str]:
+    """Return the pairs allowed to generate a signal; skipped pairs are recorded in results"""
+    candidates = []
+    for pair in pairs:
+        try:
+            # === DUPLICATE SIGNAL PREVENTION ===
+            # Map pair to symbol used in DB (Must match enhanced_strategy_integration.py)
+            symbol_map = {
+                'GBP_USD': 'GBP/USD',
+                'XAU_USD': 'GOLD',
+                'USD_JPY': 'USD/JPY'
+            }
+            symbol = symbol_map.get(pair, pair.replace('_', '/'))
+            
+            logger.info(f"🔍 Checking duplicates for {pair} (Symbol: {symbol})")
+            
+            # Check 1: Skip if PENDING signal already exists for this pair
+            pending_signal = db.query(TradingSignal).filter(
+                TradingSignal.symbol == symbol,
+                TradingSignal.status == SignalStatus.PENDING
+            ).first()
+            
+            # DISABLED: Pending signal check - signals can now generate freely
+            # if pending_signal:
+            #     results.append({
+            #         "pair": pair,
+            #         "generated": False,
+            #         "reason": f"PENDING signal already exists (ID: {pending_signal.id})"
+            #     })
+            #     logger.info(f"⏭️  {pair}: Skipped - PENDING signal exists (ID: {pending_signal.id})")
+            #     continue
+            
+            # Log pending signal info but don't block
+            if pending_signal:
+                logger.info(f"ℹ️  {pair}: Note - PENDING signal exists (ID: {pending_signal.id}) - continuing anyway")
+            
+            # Check 2: Skip if signal generated within cooldown period (1 hour)
+            cooldown_minutes = 60  # Changed from 25 to 60 minutes (1 hour)
+            cutoff_time = datetime.utcnow() - timedelta(minutes=cooldown_minutes)
+            
+            recent_signal = db.query(TradingSignal).filter(
+                TradingSignal.symbol == symbol,
+                TradingSignal.timestamp >= cutoff_time
+            ).first()
+            
+            if recent_signal:
+                minutes_ago = (datetime.utcnow() - recent_signal.timestamp).total_seconds() / 60
+                logger.info(f"Found recent signal ID: {recent_signal.id} from {recent_signal.timestamp} ({minutes_ago:.1f}m ago)")
+                
+                results.append({
+                    "pair": pair,
+                    "generated": False,
+                    "reason": f"Signal generated {minutes_ago:.0f} min ago (cooldown: {cooldown_minutes} min)"
+                })
+                logger.info(f"⏭️  {pair}: Skipped - Signal generated {minutes_ago:.0f} min ago (ID: {recent_signal.id})")
+                continue
+            
+            # === END DUPLICATE PREVENTION ===
+            
+            candidates.append(pair)
+                
+        except Exception as e:
+            logger.error(f"Error generating signal for {pair}: {e}")
+            results.append({
+                "pair": pair,
+                "generated": False,
+                "error": str(e)
+            })
+    
+    return candidates
+
+
+def _save_signals(db: Session, signals: List[TradingSignal]) -> None:
+    """Insert new signals in one transaction and load their IDs"""
+    db.add_all(signals)
+    db.commit()
+    for db_signal in signals:
+        db.refresh(db_signal)
+
+
+def _send_telegram_alert(pair: str, signal: Dict[str, Any]) -> None:
+    """Send a new-signal alert to Telegram; failures are logged, never raised"""
+    try:
+        if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+            telegram_msg = (
+                f"🚨 <b>NEW SIGNAL ALERT</b> 🚨\n\n"
+                f"📊 <b>{signal['symbol']}</b>\n"
+                f"📈 Direction: <b>{signal['direction']}</b>\n"
+                f"💰 Entry: {signal['entry']:.5f}\n"
+                f"🛡️ Stop Loss: {signal['stop_loss']:.5f}\n"
+                f"🎯 Take Profit: {signal['take_profit']:.5f}\n"
+                f"📊 Confidence: {signal['confidence_score']:.1f}%\n"
+                f"🌐 Regime: {signal.get('market_regime', 'N/A')}\n"
+                f"⏰ Time: {datetime.now().strftime('%H:%M:%S UTC')}"
+            )
+            
+            telegram_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+            requests.post(telegram_url, data={
+                "chat_id": TELEGRAM_CHAT_ID,
+                "text": telegram_msg,
+                "parse_mode": "HTML"
+            }, timeout=5)
+            logger.info(f"📱 Telegram notification sent for {pair}")
+    except Exception as tg_error:
+        logger.warning(f"⚠️ Telegram notification failed: {tg_error}")
+
+
 @app.post("/api/signals/enhanced/generate")
 async def generate_enhanced_signals(db: Session = Depends(get_db)):
     """
     Generate enhanced signals for all 3 focus pairs.
     """
     try:
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
-        strategy = get_enhanced_strategy()
+        strategy = _enhanced_strategy()
         logger.info("🚀 Generating enhanced signals for GBP/USD, XAU/USD, USD/JPY...")
         
         # Generate signals for all 3 pairs
         pairs = ['GBP_USD', 'XAU_USD', 'USD_JPY']
         results = []
+        new_signals = []
         success_count = 0
         
-        for pair in pairs:
+        candidates = await run_in_threadpool(_pairs_past_cooldown, db, pairs, results)
+        
+        # Pair analyses are dominated by OANDA fetches - run them concurrently
+        generated = await asyncio.gather(
+            *(strategy.generate_signal_for_pair(pair) for pair in candidates),
+            return_exceptions=True
+        )
+        
+        for pair, signal in zip(candidates, generated):
             try:
-                # === DUPLICATE SIGNAL PREVENTION ===
-                # Map pair to symbol used in DB (Must match enhanced_strategy_integration.py)
-                symbol_map = {
-                    'GBP_USD': 'GBP/USD',
-                    'XAU_USD': 'GOLD',
-                    'USD_JPY': 'USD/JPY'
-                }
-                symbol = symbol_map.get(pair, pair.replace('_', '/'))
-                
-                logger.info(f"🔍 Checking duplicates for {pair} (Symbol: {symbol})")
-                
-                # Check 1: Skip if PENDING signal already exists for this pair
-                pending_signal = db.query(TradingSignal).filter(
-                    TradingSignal.symbol == symbol,
-                    TradingSignal.status == SignalStatus.PENDING
-                ).first()
-                
-                # DISABLED: Pending signal check - signals can now generate freely
-                # if pending_signal:
-                #     results.append({
-                #         "pair": pair,
-                #         "generated": False,
-                #         "reason": f"PENDING signal already exists (ID: {pending_signal.id})"
-                #     })
-                #     logger.info(f"⏭️  {pair}: Skipped - PENDING signal exists (ID: {pending_signal.id})")
-                #     continue
-                
-                # Log pending signal info but don't block
-                if pending_signal:
-                    logger.info(f"ℹ️  {pair}: Note - PENDING signal exists (ID: {pending_signal.id}) - continuing anyway")
-                
-                # Check 2: Skip if signal generated within cooldown period (1 hour)
-                from datetime import datetime, timedelta
-                cooldown_minutes = 60  # Changed from 25 to 60 minutes (1 hour)
-                cutoff_time = datetime.utcnow() - timedelta(minutes=cooldown_minutes)
-                
-                recent_signal = db.query(TradingSignal).filter(
-                    TradingSignal.symbol == symbol,
-                    TradingSignal.timestamp >= cutoff_time
-                ).first()
-                
-                if recent_signal:
-                    minutes_ago = (datetime.utcnow() - recent_signal.timestamp).total_seconds() / 60
-                    logger.info(f"Found recent signal ID: {recent_signal.id} from {recent_signal.timestamp} ({minutes_ago:.1f}m ago)")
-                    
-                    results.append({
-                        "pair": pair,
-                        "generated": False,
-                        "reason": f"Signal generated {minutes_ago:.0f} min ago (cooldown: {cooldown_minutes} min)"
-                    })
-                    logger.info(f"⏭️  {pair}: Skipped - Signal generated {minutes_ago:.0f} min ago (ID: {recent_signal.id})")
-                    continue
-                
-                # === END DUPLICATE PREVENTION ===
-                
-                signal = await strategy.generate_signal_for_pair(pair)
+                if isinstance(signal, Exception):
+                    raise signal
                 
                 if signal:
                     # Save to database - FIXED: Use correct field names from signal_models.py
@@ -937,50 +1070,16 @@ async def generate_enhanced_signals(db: Session = Depends(get_db)):
                         signal_strength='STRONG' if signal.get('confidence_score', 0) > 70 else 'MEDIUM' if signal.get('confidence_score', 0) > 50 else 'WEAK',
                         notes=f"Regime: {signal.get('market_regime')}, Agreement: {signal.get('agreement', 0):.2f}, Kelly: {signal.get('kelly_fraction', 0):.3f}"
                     )
-                    db.add(db_signal)
-                    db.commit()
-                    db.refresh(db_signal)
-                    
-                    # === SEND TELEGRAM NOTIFICATION ===
-                    try:
-                        telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
-                        telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
-                        
-                        if telegram_token and telegram_chat_id:
-                            import requests
-                            telegram_msg = (
-                                f"🚨 <b>NEW SIGNAL ALERT</b> 🚨\n\n"
-                                f"📊 <b>{signal['symbol']}</b>\n"
-                                f"📈 Direction: <b>{signal['direction']}</b>\n"
-                                f"💰 Entry: {signal['entry']:.5f}\n"
-                                f"🛡️ Stop Loss: {signal['stop_loss']:.5f}\n"
-                                f"🎯 Take Profit: {signal['take_profit']:.5f}\n"
-                                f"📊 Confidence: {signal['confidence_score']:.1f}%\n"
-                                f"🌐 Regime: {signal.get('market_regime', 'N/A')}\n"
-                                f"⏰ Time: {datetime.now().strftime('%H:%M:%S UTC')}"
-                            )
-                            
-                            telegram_url = f"https://api.telegram.org/bot{telegram_token}/sendMessage"
-                            requests.post(telegram_url, data={
-                                "chat_id": telegram_chat_id,
-                                "text": telegram_msg,
-                                "parse_mode": "HTML"
-                            }, timeout=5)
-                            logger.info(f"📱 Telegram notification sent for {pair}")
-                    except Exception as tg_error:
-                        logger.warning(f"⚠️ Telegram notification failed: {tg_error}")
-                    # === END TELEGRAM NOTIFICATION ===
-                    
-                    success_count += 1
-                    results.append({
+                    result = {
                         "pair": pair,
-                        "signal_id": db_signal.id,
+                        "signal_id": None,
                         "direction": signal['direction'],
                         "confidence": signal['confidence_score'],
                         "regime": signal['market_regime'],
                         "generated": True
-                    })
-                    logger.info(f"✅ {pair}: {signal['direction']} signal saved (ID: {db_signal.id})")
+                    }
+                    new_signals.append((pair, signal, db_signal, result))
+                    results.append(result)
                 else:
                     results.append({
                         "pair": pair,
@@ -997,6 +1096,19 @@ async def generate_enhanced_signals(db: Session = Depends(get_db)):
                     "error": str(e)
                 })
         
+        results.sort(key=lambda r: pairs.index(r["pair"]))
+        
+        # Save all new signals in a single transaction
+        if new_signals:
+            await run_in_threadpool(_save_signals, db, [db_signal for _, _, db_signal, _ in new_signals])
+        
+        for pair, signal, db_signal, result in new_signals:
+            result["signal_id"] = db_signal.id
+            success_count += 1
+            logger.info(f"✅ {pair}: {signal['direction']} signal saved (ID: {db_signal.id})")
+            
+            await run_in_threadpool(_send_telegram_alert, pair, signal)
+        
         # Get strategy statistics
         stats = strategy.get_statistics()
         
@@ -1026,9 +1138,7 @@ async def generate_enhanced_signal_for_pair(pair: str, db: Session = Depends(get
                 detail=f"Invalid pair. Must be one of: GBP_USD, XAU_USD, USD_JPY"
             )
         
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
-        strategy = get_enhanced_strategy()
+        strategy = _enhanced_strategy()
         logger.info(f"🎯 Generating enhanced signal for {pair}...")
         
         signal = await strategy.generate_signal_for_pair(pair)
@@ -1049,9 +1159,7 @@ async def generate_enhanced_signal_for_pair(pair: str, db: Session = Depends(get
                 signal_strength='STRONG' if signal.get('confidence_score', 0) > 70 else 'MEDIUM' if signal.get('confidence_score', 0) > 50 else 'WEAK',
                 notes=f"Regime: {signal.get('market_regime')}, Agreement: {signal.get('agreement', 0):.2f}, Kelly: {signal.get('kelly_fraction', 0):.3f}"
             )
-            db.add(db_signal)
-            db.commit()
-            db.refresh(db_signal)
+            await run_in_threadpool(_save_signals, db, [db_signal])
             
             logger.info(f"✅ Enhanced signal saved: {pair} {signal['direction']} (ID: {db_signal.id})")
             
@@ -1106,9 +1214,7 @@ async def update_trade_result(
                 detail=f"Invalid pair. Must be one of: GBP_USD, XAU_USD, USD_JPY"
             )
         
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
-        strategy = get_enhanced_strategy()
+        strategy = _enhanced_strategy()
         strategy.update_trade_result(pair, profit_loss, risk)
         
         # Get updated Kelly stats
@@ -1139,9 +1245,7 @@ async def update_trade_result(
 async def get_enhanced_statistics():
     """Get enhanced strategy statistics including regime and Kelly data"""
     try:
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
-        strategy = get_enhanced_strategy()
+        strategy = _enhanced_strategy()
         stats = strategy.get_statistics()
         
         return {
@@ -1158,7 +1262,7 @@ async def get_enhanced_statistics():
 # ==================== JOURNAL ENDPOINTS ====================
 
 @app.post("/api/journal/entries")
-async def create_journal_entry(entry: dict, db: Session = Depends(get_db)):
+def create_journal_entry(entry: dict, db: Session = Depends(get_db)):
     """Create a new journal entry"""
     try:
         new_entry = JournalCRUD.create_entry(db, entry)
@@ -1172,21 +1276,28 @@ async def create_journal_entry(entry: dict, db: Session = Depends(get_db)):
 
 
 @app.get("/api/journal/entries")
-async def get_journal_entries(
-    skip: int = 0,
-    limit: int = 1000,
+def get_journal_entries(
+    cursor: Optional[int] = None,
+    limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    """Get all journal entries"""
-    entries = JournalCRUD.get_all_entries(db, skip=skip, limit=limit)
-    return {
-        "entries": [e.to_dict() for e in entries],
-        "total": len(entries)
-    }
+    """
+    Get journal entries newest first, one page at a time.
+    Pass `next_cursor` from the previous response as `cursor` to get the next page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    entries = JournalCRUD.list_dicts(db, limit=limit + 1, cursor=cursor)
+    next_cursor = entries[limit - 1]['id'] if len(entries) > limit else None
+    entries = entries[:limit]
+    return ORJSONResponse(content={
+        "entries": entries,
+        "total": len(entries),
+        "next_cursor": next_cursor
+    })
 
 
 @app.get("/api/journal/entries/{entry_id}")
-async def get_journal_entry(entry_id: int, db: Session = Depends(get_db)):
+def get_journal_entry(entry_id: int, db: Session = Depends(get_db)):
     """Get a specific journal entry"""
     entry = JournalCRUD.get_entry(db, entry_id)
     if not entry:
@@ -1195,7 +1306,7 @@ async def get_journal_entry(entry_id: int, db: Session = Depends(get_db)):
 
 
 @app.put("/api/journal/entries/{entry_id}")
-async def update_journal_entry(
+def update_journal_entry(
     entry_id: int,
     updates: dict,
     db: Session = Depends(get_db)
@@ -1212,7 +1323,7 @@ async def update_journal_entry(
 
 
 @app.delete("/api/journal/entries/{entry_id}")
-async def delete_journal_entry(entry_id: int, db: Session = Depends(get_db)):
+def delete_journal_entry(entry_id: int, db: Session = Depends(get_db)):
     """Delete a journal entry"""
     success = JournalCRUD.delete_entry(db, entry_id)
     if not success:
@@ -1224,82 +1335,46 @@ async def delete_journal_entry(entry_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/api/journal/statistics")
-async def get_journal_statistics(db: Session = Depends(get_db)):
+def get_journal_statistics(db: Session = Depends(get_db)):
     """Get journal statistics"""
     stats = JournalCRUD.get_statistics(db)
-    return stats
+    return ORJSONResponse(content=stats)
 
 
-# ============================================================================
-# TRADING SIGNALS ENDPOINTS
-# ============================================================================
+# ==================== REJECTION REPORT ENDPOINTS ====================
 
-@app.get("/api/signals")
-async def get_all_signals(
-    status: Optional[str] = None,
-    symbol: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
-):
-    """
-    Get trading signals with optional filters
-    - status: PENDING, ACTIVE, CLOSED, CANCELLED, EXPIRED
-    - symbol: XAU_USD, GBP_USD, USD_JPY
-    """
-    try:
-        from database.signal_crud import SignalCRUD
-        from database.signal_models import SignalStatus
-        
-        if status:
-            # Filter by status
-            status_enum = SignalStatus[status]
-            signals = SignalCRUD.get_signals_by_status(db, status_enum)
-        elif symbol:
-            # Filter by symbol
-            signals = SignalCRUD.get_signals_by_symbol(db, symbol)
-        else:
-            # Get all signals
-            signals = SignalCRUD.get_all_signals(db, skip=skip, limit=limit)
-        
-        return {
-            "success": True,
-            "count": len(signals),
-            "signals": [signal.to_dict() for signal in signals]
-        }
-    except Exception as e:
-        logger.error(f"Error fetching signals: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+REPORTS_DIR = Path(__file__).parent / "reports"
 
+# Latest report path, valid while the reports directory mtime is unchanged
+_latest_report_cache = {"mtime_ns": None, "path": None}
+
+
+def find_latest_report(reports_dir: Path) -> Optional[Path]:
+    """Return the newest rejected_signals_*.json, rescanning only when the directory changes"""
+    mtime_ns = reports_dir.stat().st_mtime_ns
+    if _latest_report_cache["mtime_ns"] == mtime_ns:
+        return _latest_report_cache["path"]
+
+    # Filenames are rejected_signals_YYYY-MM-DD.json, so name order is date order
+    latest = max(reports_dir.glob("rejected_signals_*.json"), key=lambda p: p.name, default=None)
+
+    _latest_report_cache["mtime_ns"] = mtime_ns
+    _latest_report_cache["path"] = latest
+    return latest
 
-# ==================== REJECTION REPORT ENDPOINTS ====================
 
 @app.get("/api/rejections")
-async def get_rejections(date: Optional[str] = None, format: str = "json"):
+def get_rejections(request: Request, date: Optional[str] = None, format: str = "json"):
     """
     Fetch rejected-signal report.
     - date: YYYY-MM-DD (optional). If omitted, serves the latest available report.
     - format: 'json' (default) or 'csv'
+    Responses carry an ETag; a matching If-None-Match gets 304 without reading the file.
     """
     try:
-        reports_dir = Path(__file__).parent / "reports"
+        reports_dir = REPORTS_DIR
         reports_dir.mkdir(exist_ok=True)
 
-        def find_latest_report() -> Path:
-            files = sorted(reports_dir.glob("rejected_signals_*.json"))
-            if not files:
-                return None
-            # Sort by date parsed from filename; fallback to modified time
-            def date_key(p: Path):
-                try:
-                    # Filename: rejected_signals_YYYY-MM-DD.json
-                    d = p.stem.split("_")[-1]
-                    return datetime.strptime(d, "%Y-%m-%d")
-                except Exception:
-                    return datetime.fromtimestamp(p.stat().st_mtime)
-            files.sort(key=date_key, reverse=True)
-            return files[0]
-
         report_path: Path
         if date:
             report_path = reports_dir / f"rejected_signals_{date}.json"
@@ -1307,7 +1382,7 @@ async def get_rejections(date: Optional[str] = None, format: str = "json"):
                 raise HTTPException(status_code=404, detail=f"Report for {date} not found")
             target_date = date
         else:
-            latest = find_latest_report()
+            latest = find_latest_report(reports_dir)
             if latest is None:
                 raise HTTPException(status_code=404, detail="No rejection reports available")
             report_path = latest
@@ -1317,65 +1392,43 @@ async def get_rejections(date: Optional[str] = None, format: str = "json"):
             except Exception:
                 target_date = datetime.now().strftime("%Y-%m-%d")
 
-        with report_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        fmt = format.lower()
+        if fmt not in ("json", "csv"):
+            raise HTTPException(status_code=400, detail="Invalid format. Use 'json' or 'csv'")
+
+        # Reports are written once per day, so the file stat identifies the content
+        stat = report_path.stat()
+        cache_headers = {
+            "ETag": f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}-{fmt}"',
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": "public, max-age=60",
+        }
+        if request.headers.get("if-none-match") == cache_headers["ETag"]:
+            return Response(status_code=304, headers=cache_headers)
+
+        filename = f"rejected_signals_{target_date}.csv"
+        if fmt == "csv":
+            # Prefer the CSV the report job wrote alongside the JSON
+            csv_path = report_path.with_suffix(".csv")
+            if csv_path.exists() and csv_path.stat().st_mtime_ns >= stat.st_mtime_ns:
+                return FileResponse(csv_path, media_type="text/csv", filename=filename, headers=cache_headers)
 
-        if format.lower() == "json":
+        data = orjson.loads(report_path.read_bytes())
+
+        if fmt == "json":
             # Attach file metadata for convenience
             data_with_meta = {
                 **data,
                 "file": report_path.name,
                 "path": str(report_path)
             }
-            return JSONResponse(content=data_with_meta)
-
-        if format.lower() == "csv":
-            # Flatten rejections into CSV rows
-            rejections = data.get("rejections", [])
-            output = io.StringIO()
-            writer = csv.writer(output)
-            header = [
-                "date", "hour", "timestamp", "instrument", "regime", "reason",
-                "strength", "agreement", "buy_votes", "sell_votes", "confidence",
-                "atr_pct", "adx", "volatility_ok", "strength_ok", "adx_ok",
-                "last_price", "suggested_direction", "proposed_entry",
-                "proposed_stop_loss", "proposed_take_profit"
-            ]
-            writer.writerow(header)
-            for r in rejections:
-                m = r.get("metrics", {})
-                writer.writerow([
-                    data.get("date", target_date),
-                    r.get("hour"),
-                    r.get("timestamp"),
-                    r.get("instrument"),
-                    r.get("regime"),
-                    r.get("reason"),
-                    m.get("strength"),
-                    m.get("agreement"),
-                    m.get("buy_votes"),
-                    m.get("sell_votes"),
-                    m.get("confidence"),
-                    m.get("atr_pct"),
-                    m.get("adx"),
-                    m.get("volatility_ok"),
-                    m.get("strength_ok"),
-                    m.get("adx_ok"),
-                    m.get("last_price"),
-                    m.get("suggested_direction"),
-                    m.get("proposed_entry"),
-                    m.get("proposed_stop_loss"),
-                    m.get("proposed_take_profit"),
-                ])
-
-            csv_bytes = output.getvalue().encode("utf-8")
-            output.close()
-            filename = f"rejected_signals_{target_date}.csv"
-            headers = {"Content-Disposition": f"attachment; filename={filename}"}
-            return StreamingResponse(io.BytesIO(csv_bytes), media_type="text/csv", headers=headers)
-
-        # Unsupported format
-        raise HTTPException(status_code=400, detail="Invalid format. Use 'json' or 'csv'")
+            return ORJSONResponse(content=data_with_meta, headers=cache_headers)
+
+        # Legacy report without a CSV sidecar - flatten on the fly
+        headers = {"Content-Disposition": f"attachment; filename={filename}", **cache_headers}
+        return StreamingResponse(
+            rejection_csv_rows(data, target_date), media_type="text/csv", headers=headers
+        )
 
     except HTTPException:
         raise
@@ -1385,53 +1438,49 @@ async def get_rejections(date: Optional[str] = None, format: str = "json"):
 
 
 @app.get("/api/rejections/latest")
-async def get_latest_rejections(format: str = "json"):
+def get_latest_rejections(request: Request, format: str = "json"):
     """Shortcut to fetch the latest rejection report in the desired format."""
-    return await get_rejections(date=None, format=format)
+    return get_rejections(request, date=None, format=format)
 
 
 @app.get("/api/signals/active")
-async def get_active_signals(db: Session = Depends(get_db)):
+def get_active_signals(db: Session = Depends(get_db)):
     """Get all active trading signals"""
     try:
-        from database.signal_crud import SignalCRUD
         
         signals = SignalCRUD.get_active_signals(db)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(signals),
-            "signals": [signal.to_dict() for signal in signals]
-        }
+            "signals": signals
+        })
     except Exception as e:
         logger.error(f"Error fetching active signals: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/signals/pending")
-async def get_pending_signals(db: Session = Depends(get_db)):
+def get_pending_signals(db: Session = Depends(get_db)):
     """Get all pending trading signals (not yet entered)"""
     try:
-        from database.signal_crud import SignalCRUD
-        from database.signal_models import SignalStatus
         
         signals = SignalCRUD.get_signals_by_status(db, SignalStatus.PENDING)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(signals),
-            "signals": [signal.to_dict() for signal in signals]
-        }
+            "signals": signals
+        })
     except Exception as e:
         logger.error(f"Error fetching pending signals: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/signals/{signal_id}")
-async def get_signal(signal_id: int, db: Session = Depends(get_db)):
+def get_signal(signal_id: int, db: Session = Depends(get_db)):
     """Get a specific signal by ID"""
     try:
-        from database.signal_crud import SignalCRUD
         
         signal = SignalCRUD.get_signal(db, signal_id)
         
@@ -1450,10 +1499,9 @@ async def get_signal(signal_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/api/signals")
-async def create_signal(signal_data: dict, db: Session = Depends(get_db)):
+def create_signal(signal_data: dict, db: Session = Depends(get_db)):
     """Create a new trading signal"""
     try:
-        from database.signal_crud import SignalCRUD
         
         signal = SignalCRUD.create_signal(db, signal_data)
         
@@ -1468,17 +1516,17 @@ async def create_signal(signal_data: dict, db: Session = Depends(get_db)):
 
 
 @app.put("/api/signals/{signal_id}/status")
-async def update_signal_status(
+def update_signal_status(
     signal_id: int,
     status: str,
     db: Session = Depends(get_db)
 ):
     """Update signal status (PENDING -> ACTIVE -> CLOSED)"""
+    status_enum = _STATUS_MAP.get(status.upper())
+    if status_enum is None:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    
     try:
-        from database.signal_crud import SignalCRUD
-        from database.signal_models import SignalStatus
-        
-        status_enum = SignalStatus[status]
         signal = SignalCRUD.update_signal_status(db, signal_id, status_enum)
         
         if not signal:
@@ -1489,8 +1537,6 @@ async def update_signal_status(
             "message": f"Signal status updated to {status}",
             "signal": signal.to_dict()
         }
-    except KeyError:
-        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
     except HTTPException:
         raise
     except Exception as e:
@@ -1498,24 +1544,6 @@ async def update_signal_status(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/journal/statistics")
-async def get_journal_statistics(db: Session = Depends(get_db)):
-    """Get trading performance statistics from JOURNAL (actual trades with outcomes)"""
-    try:
-        from database.journal_crud import JournalCRUD
-        
-        stats = JournalCRUD.get_statistics(db)
-        
-        return {
-            "success": True,
-            "statistics": stats,
-            "note": "These statistics are based on actual trades from your trading journal"
-        }
-    except Exception as e:
-        logger.error(f"Error fetching journal statistics: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("🚀 Starting AlphaForge API Server")
@@ -1529,5 +1557,7 @@ if __name__ == "__main__":
         app,
         host="127.0.0.1",
         port=5000,
-        log_level="info"
+        log_level="info",
+        loop="uvloop" if sys.platform != "win32" else "asyncio",  # uvloop has no Windows support
+        http="httptools"
     )
@@ -7,6 +7,7 @@ FastAPI backend for trading dashboard with database integration
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import uvicorn
@@ -18,6 +19,7 @@ import io
 import csv
 import asyncio
 import os
+import random
 import logging
 
 # Setup logging
@@ -40,6 +42,15 @@ from database.trade_calculator import TradeCalculator
 from database.journal_models import JournalEntry
 from database.journal_crud import JournalCRUD
 from enhanced_signal_generator import EnhancedSignalGenerator
+from enhanced_strategy_integration import get_enhanced_strategy
+
+# Optional day trading generator - resolved once at startup, not per request
+try:
+    from day_trading_signal_generator import DayTradingSignalGenerator
+except ImportError:
+    DayTradingSignalGenerator = None
+    logger.warning("⚠️ day_trading_signal_generator not available - /api/signals/generate disabled")
+
 # import strategy_variables as config  # Not needed - all config from .env
 
 # Database setup - Read from environment
@@ -75,6 +86,9 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Compress larger JSON/CSV payloads (signal and journal lists, rejection reports)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Database dependency
 def get_db():
     db = SessionLocal()
@@ -166,7 +180,6 @@ async def get_status_api():
     
     # Check Gemini status
     try:
-        import os
         gemini_key = os.getenv('GEMINI_API_KEY')
         state["gemini_status"] = "configured" if gemini_key else "not configured"
     except:
@@ -174,7 +187,6 @@ async def get_status_api():
     
     # Check OANDA status
     try:
-        import os
         oanda_key = os.getenv('OANDA_API_KEY')
         state["oanda_status"] = "connected" if oanda_key else "disconnected"
     except:
@@ -243,8 +255,6 @@ async def get_live_prices():
     """Get real-time prices (mock for now if OANDA not connected)"""
     # In a real implementation, this would fetch from OANDA or cache
     # For now, returning mock data to satisfy frontend
-    import random
-    
     mock_prices = {
         "GBP_USD": {"bid": 1.2650 + random.uniform(-0.0010, 0.0010), "ask": 1.2652 + random.uniform(-0.0010, 0.0010), "time": datetime.now().isoformat()},
         "XAU_USD": {"bid": 2030.50 + random.uniform(-1.0, 1.0), "ask": 2031.00 + random.uniform(-1.0, 1.0), "time": datetime.now().isoformat()},
@@ -446,7 +456,6 @@ async def stop_strategy():
 async def get_stats(db: Session = Depends(get_db)):
     """Get trading statistics from JOURNAL (not signals)"""
     try:
-        from database.journal_crud import JournalCRUD
         stats = JournalCRUD.get_statistics(db)
         
         return {
@@ -605,9 +614,10 @@ async def get_symbols():
 @app.post("/api/signals/generate")
 async def generate_signals(all_instruments: bool = True):
     """Generate trading signals using Day Trading Signal Generator (H1 timeframe, 1:2 RR)"""
+    if DayTradingSignalGenerator is None:
+        raise HTTPException(status_code=503, detail="Day trading signal generator is not available")
+    
     try:
-        from day_trading_signal_generator import DayTradingSignalGenerator
-        
         generator = DayTradingSignalGenerator()
         logger.info("📊 Using Day Trading Signal Generator (H1 timeframe, 1:2 RR)")
         
@@ -639,11 +649,13 @@ async def generate_signals(all_instruments: bool = True):
 @app.post("/api/signals/generate/{instrument}")
 async def generate_signals_specific(instrument: str):
     """Generate day trading signal for a specific instrument (H1 timeframe, 1:2 RR)"""
+    if DayTradingSignalGenerator is None:
+        raise HTTPException(status_code=503, detail="Day trading signal generator is not available")
+    
     try:
         if not instrument or instrument.strip() == "":
             raise HTTPException(status_code=400, detail="Instrument cannot be empty")
         
-        from day_trading_signal_generator import DayTradingSignalGenerator
         generator = DayTradingSignalGenerator()
         logger.info(f"📊 Generating day trading signal for {instrument} (H1 timeframe)")
         
@@ -712,8 +724,6 @@ async def generate_enhanced_signal_for_pair(pair: str, db: Session = Depends(get
                 detail=f"Invalid pair. Must be one of: GBP_USD, XAU_USD, USD_JPY"
             )
         
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
         strategy = get_enhanced_strategy()
         logger.info(f"🎯 Generating enhanced signal for {pair}...")
         
@@ -803,8 +813,6 @@ async def update_trade_result(
                 detail=f"Invalid pair. Must be one of: GBP_USD, XAU_USD, USD_JPY"
             )
         
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
         strategy = get_enhanced_strategy()
         strategy.update_trade_result(pair, profit_loss, risk)
         
@@ -836,8 +844,6 @@ async def update_trade_result(
 async def get_enhanced_statistics():
     """Get enhanced strategy statistics including regime and Kelly data"""
     try:
-        from enhanced_strategy_integration import get_enhanced_strategy
-        
         strategy = get_enhanced_strategy()
         stats = strategy.get_statistics()
         
@@ -945,9 +951,6 @@ async def get_all_signals(
     - symbol: XAU_USD, GBP_USD, USD_JPY
     """
     try:
-        from database.signal_crud import SignalCRUD
-        from database.signal_models import SignalStatus
-        
         if status:
             # Filter by status
             status_enum = SignalStatus[status]
@@ -1091,8 +1094,6 @@ async def get_latest_rejections(format: str = "json"):
 async def get_active_signals(db: Session = Depends(get_db)):
     """Get all active trading signals"""
     try:
-        from database.signal_crud import SignalCRUD
-        
         signals = SignalCRUD.get_active_signals(db)
         
         return {
@@ -1109,9 +1110,6 @@ async def get_active_signals(db: Session = Depends(get_db)):
 async def get_pending_signals(db: Session = Depends(get_db)):
     """Get all pending trading signals (not yet entered)"""
     try:
-        from database.signal_crud import SignalCRUD
-        from database.signal_models import SignalStatus
-        
         signals = SignalCRUD.get_signals_by_status(db, SignalStatus.PENDING)
         
         return {
@@ -1128,8 +1126,6 @@ async def get_pending_signals(db: Session = Depends(get_db)):
 async def get_signal(signal_id: int, db: Session = Depends(get_db)):
     """Get a specific signal by ID"""
     try:
-        from database.signal_crud import SignalCRUD
-        
         signal = SignalCRUD.get_signal(db, signal_id)
         
         if not signal:
@@ -1150,8 +1146,6 @@ async def get_signal(signal_id: int, db: Session = Depends(get_db)):
 async def create_signal(signal_data: dict, db: Session = Depends(get_db)):
     """Create a new trading signal"""
     try:
-        from database.signal_crud import SignalCRUD
-        
         signal = SignalCRUD.create_signal(db, signal_data)
         
         return {
@@ -1172,9 +1166,6 @@ async def update_signal_status(
 ):
     """Update signal status (PENDING -> ACTIVE -> CLOSED)"""
     try:
-        from database.signal_crud import SignalCRUD
-        from database.signal_models import SignalStatus
-        
         status_enum = SignalStatus[status]
         signal = SignalCRUD.update_signal_status(db, signal_id, status_enum)
         
@@ -1199,8 +1190,6 @@ async def update_signal_status(
 async def get_journal_statistics(db: Session = Depends(get_db)):
     """Get trading performance statistics from JOURNAL (actual trades with outcomes)"""
     try:
-        from database.journal_crud import JournalCRUD
-        
         stats = JournalCRUD.get_statistics(db)
         
         return {
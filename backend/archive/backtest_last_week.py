@@ -6,7 +6,7 @@ Extended backtest to see signal generation patterns
 
 from datetime import datetime, timedelta
 from oanda_backtest_engine import OANDAHistoricalBacktester
-import json
+import orjson
 import pandas as pd
 
 def run_last_week_backtest():
@@ -98,10 +98,11 @@ def run_last_week_backtest():
             
             # Show all trades
             print(f"\n📋 Trade Details:")
-            for i, trade in enumerate(results['trades'], 1):
+            trades = results['trades']
+            entry_times = pd.to_datetime([t['entry_time'] for t in trades]).strftime('%m-%d %H:%M')
+            exit_times = pd.to_datetime([t['exit_time'] for t in trades]).strftime('%m-%d %H:%M')
+            for i, (trade, entry_time, exit_time) in enumerate(zip(trades, entry_times, exit_times), 1):
                 pnl_symbol = "✅" if trade['pnl'] > 0 else "❌"
-                entry_time = pd.to_datetime(trade['entry_time']).strftime('%m-%d %H:%M')
-                exit_time = pd.to_datetime(trade['exit_time']).strftime('%m-%d %H:%M')
                 print(f"   {i}. {pnl_symbol} {trade['direction']} | "
                       f"{entry_time} → {exit_time} | "
                       f"P&L: ${trade['pnl']:.2f} | "
@@ -113,48 +114,45 @@ def run_last_week_backtest():
             # Let's check why no signals were generated
             print(f"\n🔍 Debugging: Why no signals?")
             
-            # Look at the last 50 bars and check conditions
+            # Look at the last 50 bars and score the conditions column-wise
             recent_data = df.tail(50)
-            signal_count = 0
+            rsi_in_range = (recent_data['rsi'] > 30) & (recent_data['rsi'] < 70)
             
-            for i in range(len(recent_data)):
-                row = recent_data.iloc[i]
-                
-                # Check bullish conditions
-                bullish_conditions = [
-                    row['close'] > row['sma_20'],
-                    row['sma_20'] > row['sma_50'],
-                    30 < row['rsi'] < 70,
-                    row['macd'] > row['macd_signal'],
-                    row['close'] > row['bb_lower'],
-                ]
-                
-                # Check bearish conditions  
-                bearish_conditions = [
-                    row['close'] < row['sma_20'],
-                    row['sma_20'] < row['sma_50'],
-                    30 < row['rsi'] < 70,
-                    row['macd'] < row['macd_signal'],
-                    row['close'] < row['bb_upper'],
-                ]
-                
-                bullish_score = sum(bullish_conditions)
-                bearish_score = sum(bearish_conditions)
-                
-                if bullish_score >= 3 or bearish_score >= 3:  # Lower threshold for debugging
-                    signal_count += 1
-                    signal_type = "BULLISH" if bullish_score > bearish_score else "BEARISH"
-                    score = max(bullish_score, bearish_score)
-                    timestamp = row.name.strftime('%m-%d %H:%M')
-                    print(f"   {timestamp}: {signal_type} potential (score: {score}/5)")
+            bullish_score = (
+                (recent_data['close'] > recent_data['sma_20']).astype(int)
+                + (recent_data['sma_20'] > recent_data['sma_50']).astype(int)
+                + rsi_in_range.astype(int)
+                + (recent_data['macd'] > recent_data['macd_signal']).astype(int)
+                + (recent_data['close'] > recent_data['bb_lower']).astype(int)
+            )
+            bearish_score = (
+                (recent_data['close'] < recent_data['sma_20']).astype(int)
+                + (recent_data['sma_20'] < recent_data['sma_50']).astype(int)
+                + rsi_in_range.astype(int)
+                + (recent_data['macd'] < recent_data['macd_signal']).astype(int)
+                + (recent_data['close'] < recent_data['bb_upper']).astype(int)
+            )
+            
+            # Lower threshold for debugging
+            potential = (bullish_score >= 3) | (bearish_score >= 3)
+            signal_count = int(potential.sum())
+            
+            for ts, bull, bear in zip(recent_data.index[potential], bullish_score[potential], bearish_score[potential]):
+                signal_type = "BULLISH" if bull > bear else "BEARISH"
+                score = max(bull, bear)
+                print(f"   {ts.strftime('%m-%d %H:%M')}: {signal_type} potential (score: {score}/5)")
             
             print(f"   Potential signals found: {signal_count} (with score ≥3/5)")
             print(f"   Current threshold requires: 4/5 conditions")
         
         # Save results
         results_file = f"backtest_results_week_{start_date}_to_{end_date}.json"
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str  # pandas Timestamps and other leftovers
+            ))
         
         print(f"\n💾 Results saved to: {results_file}")
         print("="*80)
@@ -5,7 +5,6 @@ Quick Backtest Summary for Yesterday's OANDA Data
 
 from datetime import datetime, timedelta
 from oanda_backtest_engine import OANDAHistoricalBacktester
-import json
 
 def quick_backtest_summary():
     """Run a quick backtest and show summary"""
@@ -66,7 +65,7 @@ def quick_backtest_summary():
                 recent_trades = results['trades'][-5:]
                 for i, trade in enumerate(recent_trades, 1):
                     pnl_symbol = "✅" if trade['pnl'] > 0 else "❌"
-                    entry_time = datetime.fromisoformat(trade['entry_time'].replace('Z', '+00:00'))
+                    entry_time = datetime.fromisoformat(trade['entry_time'])  # accepts a trailing Z on 3.11+
                     print(f"   {i}. {pnl_symbol} {trade['direction']} | "
                           f"{entry_time.strftime('%m-%d %H:%M')} | "
                           f"P&L: ${trade['pnl']:.2f} | "
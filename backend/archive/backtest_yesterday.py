@@ -4,9 +4,10 @@ Backtest AlphaForge Strategy for Yesterday's Data
 Uses OANDA historical data to test strategy performance
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from oanda_backtest_engine import OANDAHistoricalBacktester
-import json
+import orjson
 
 def run_yesterday_backtest():
     """Run backtest for yesterday's trading data"""
@@ -28,27 +29,39 @@ def run_yesterday_backtest():
     print("="*80)
     
     try:
-        # Initialize backtester
-        backtester = OANDAHistoricalBacktester()
-        
         # Test multiple instruments
         instruments = ["GBP_USD", "EUR_USD", "XAU_USD", "USD_JPY"]
-        all_results = {}
+        all_results = dict.fromkeys(instruments)  # keeps report order fixed
+        
+        def backtest_instrument(instrument):
+            # One backtester per worker so runs don't share trade state
+            backtester = OANDAHistoricalBacktester()
+            return backtester.run_backtest(
+                instrument=instrument,
+                start_date=start_date,
+                end_date=end_date,
+                granularity="M15"  # 15-minute timeframe for more signals
+            )
+        
+        # The runs are dominated by independent OANDA fetches, so do them in parallel
+        print(f"\n⏳ Running {len(instruments)} backtests in parallel...")
+        with ThreadPoolExecutor(max_workers=len(instruments)) as executor:
+            futures = {executor.submit(backtest_instrument, inst): inst for inst in instruments}
+            for future in as_completed(futures):
+                instrument = futures[future]
+                try:
+                    all_results[instrument] = future.result()
+                except Exception as e:
+                    all_results[instrument] = {"error": str(e)}
         
         for instrument in instruments:
             print(f"\n🔍 Testing {instrument}...")
             print("-" * 50)
             
             try:
-                # Run backtest for this instrument
-                results = backtester.run_backtest(
-                    instrument=instrument,
-                    start_date=start_date,
-                    end_date=end_date,
-                    granularity="M15"  # 15-minute timeframe for more signals
-                )
-                
-                all_results[instrument] = results
+                results = all_results[instrument]
+                if "error" in results:
+                    raise RuntimeError(results["error"])
                 
                 # Display results
                 summary = results['summary']
@@ -114,8 +127,12 @@ def run_yesterday_backtest():
         
         # Save results to file
         results_file = f"backtest_results_{yesterday_str}.json"
-        with open(results_file, 'w') as f:
-            json.dump(all_results, f, indent=2, default=str)
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(
+                all_results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str  # pandas Timestamps and other leftovers
+            ))
         
         print(f"\n💾 Results saved to: {results_file}")
         print("="*80)
@@ -11,14 +11,23 @@ NEW WORKFLOW:
 """
 
 import os
+import signal
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
+try:
+    import redis  # optional - shares signal cooldowns across generator workers
+except ImportError:
+    redis = None
+
 # Load environment variables
 load_dotenv()
 
@@ -44,6 +53,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _last_value(df: pd.DataFrame, column: str, default=None):
+    """Newest value of a column read straight from its numpy array (no row Series)"""
+    if column not in df.columns:
+        return default
+    return df[column].to_numpy()[-1]
+
+
+def _top_k(values: np.ndarray, k: int, largest: bool) -> List[float]:
+    """
+    k largest (descending) or smallest (ascending) non-NaN values via np.partition -
+    same output as Series.nlargest/nsmallest without sorting the whole column
+    """
+    values = values[~np.isnan(values)]
+    if len(values) > k:
+        values = np.partition(values, -k)[-k:] if largest else np.partition(values, k)[:k]
+    values = np.sort(values)
+    return (values[::-1] if largest else values).tolist()
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: acquire() returns at once while tokens remain and
+    only blocks when a burst has used them up, then paces calls at `rate` per second
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token now (possibly going negative) so waiters queue in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# Columns detect_technical_setup reads, pulled out of the frame once per call
+_SETUP_COLUMNS = ('long_trigger', 'short_trigger', 'close', 'atr', 'rsi', 'ema_200', 'volume', 'adx')
+
+
+# Trading session by local hour (0-23); London takes precedence over the 13-16 overlap
+_SESSION_BY_HOUR = tuple(
+    "LONDON" if 7 <= hour < 16 else "NEW_YORK" if 13 <= hour < 22 else "ASIAN"
+    for hour in range(24)
+)
+
+
+# How long an indicator-augmented frame is reused per timeframe (seconds).
+# Higher timeframes barely move between confirmations, so they live longer.
+MTF_CACHE_TTL = {
+    'M5': 30,
+    'M15': 60,
+    'H1': 300,
+    'H4': 900,
+    'D1': 3600
+}
+
 
 class EnhancedSignalGenerator:
     """
@@ -96,17 +170,33 @@ class EnhancedSignalGenerator:
         self.lookback_bars = 500
         
         # Signal tracking
-        self.last_signal_time = {}
+        self.last_signal_time = {}  # instrument -> time.monotonic() of last saved signal
+        self._last_df_ts = {}  # newest bar already analysed, per instrument
+        # (instrument, timeframe) -> (fetched_at, frame with indicators)
+        self._mtf_cache: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
         self.cooldown_minutes = 15  # Minimum time between signals per instrument
-        # Gemini throttle tracking to avoid rapid repeated API calls
+        self._cooldown_sec = self.cooldown_minutes * 60
+        # Gemini throttle tracking to avoid rapid repeated API calls (time.monotonic())
         self._last_gemini_call_ts = None
+        # Instruments are scanned concurrently; guards the cooldown and throttle state
+        self._lock = threading.Lock()
+        # Shared cooldown store when REDIS_URL is set (None -> per-process dict)
+        self._redis = self._init_redis()
+        # Shared OANDA request budget for all scan threads
+        oanda_rate = getattr(config, 'OANDA_REQUESTS_PER_SECOND', 10)
+        self._oanda_limiter = _TokenBucket(rate=oanda_rate, capacity=oanda_rate)
+        # Set by stop() to end run_continuous without waiting out the scan interval
+        self._stop = threading.Event()
         
         logger.info(f"✅ Initialized for instruments: {', '.join(self.instruments)}")
     
     def _init_database(self):
-        """Initialize signal database"""
+        """Initialize signal database (engine and session factory are reused for every save)"""
+        self._engine = None
+        self._SessionLocal = None
         try:
             from sqlalchemy import create_engine
+            from sqlalchemy.orm import sessionmaker
             from database.signal_models import Base as SignalBase
             
             # Get database URL from environment
@@ -117,19 +207,92 @@ class EnhancedSignalGenerator:
                 engine = create_engine(
                     database_url,
                     pool_pre_ping=True,
-                    pool_recycle=300
+                    pool_recycle=300,
+                    pool_size=5,
+                    max_overflow=10,
+                    pool_timeout=10  # fail a save quickly rather than stall a scan
                 )
             else:
+                # File SQLite already gets a QueuePool (5 + 10 overflow) on SQLAlchemy 2.x
                 engine = create_engine(
                     database_url,
                     connect_args={"check_same_thread": False}
                 )
             
             SignalBase.metadata.create_all(bind=engine)
+            self._engine = engine
+            self._SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
             logger.info("✅ Signal database initialized")
         except Exception as e:
             logger.warning(f"⚠️ Database initialization warning: {e}")
     
+    def _init_redis(self):
+        """Connect to Redis for cross-worker cooldowns, if configured and reachable"""
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            return None
+        if redis is None:
+            logger.warning("⚠️ REDIS_URL set but redis package not installed - using in-process cooldowns")
+            return None
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_timeout=1.0)
+            client.ping()
+            logger.info("✅ Redis cooldown store connected")
+            return client
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Redis unavailable ({e}) - using in-process cooldowns")
+            return None
+    
+    def _cooldown_active(self, instrument: str) -> bool:
+        """True if a signal for this instrument was saved within the cooldown window"""
+        if self._redis is not None:
+            try:
+                if not self._redis.exists(f"cooldown:{instrument}"):
+                    return False
+                logger.info(f"⏳ Cooldown active for {instrument} (shared)")
+                return True
+            except redis.RedisError as e:
+                logger.warning(f"⚠️ Redis cooldown check failed: {e}")
+        with self._lock:
+            last_signal_time = self.last_signal_time.get(instrument)
+        if last_signal_time is None:
+            return False
+        elapsed = time.monotonic() - last_signal_time
+        if elapsed < self._cooldown_sec:
+            logger.info(f"⏳ Cooldown active: {elapsed / 60:.1f}/{self.cooldown_minutes} min")
+            return True
+        return False
+    
+    def _claim_cooldown(self, instrument: str) -> bool:
+        """
+        Atomically start the cooldown for an instrument. Returns False if another
+        scan (or, with Redis, another worker) already claimed it, so the signal
+        is not saved twice.
+        """
+        if self._redis is not None:
+            try:
+                # SET NX EX - check and start the cooldown in one round trip
+                return self._redis.set(f"cooldown:{instrument}", "1", nx=True, ex=self._cooldown_sec) is not None
+            except redis.RedisError as e:
+                logger.warning(f"⚠️ Redis cooldown claim failed: {e}")
+        with self._lock:
+            now = time.monotonic()
+            last_signal_time = self.last_signal_time.get(instrument)
+            if last_signal_time is not None and now - last_signal_time < self._cooldown_sec:
+                return False
+            self.last_signal_time[instrument] = now
+            return True
+    
+    def _release_cooldown(self, instrument: str):
+        """Undo a claim when the signal could not be saved"""
+        if self._redis is not None:
+            try:
+                self._redis.delete(f"cooldown:{instrument}")
+            except redis.RedisError as e:
+                logger.warning(f"⚠️ Redis cooldown release failed: {e}")
+        with self._lock:
+            self.last_signal_time.pop(instrument, None)
+    
     # ========================================================================
     # STEP 1-7: TECHNICAL ANALYSIS (AlphaForge Strategy)
     # ========================================================================
@@ -142,7 +305,17 @@ class EnhancedSignalGenerator:
             Raw signal dictionary if setup detected, None otherwise
         """
         try:
-            logger.info(f"📊 Running technical analysis on {instrument}...")
+            if df.empty or len(df) < 2:
+                return None
+            
+            # Triggers only change when a new bar closes - skip bars already analysed
+            newest_ts = df.index[-1]
+            if self._last_df_ts.get(instrument) == newest_ts:
+                logger.info("ℹ️ No new bar for %s since last scan", instrument)
+                return None
+            self._last_df_ts[instrument] = newest_ts
+            
+            logger.info("📊 Running technical analysis on %s...", instrument)
             
             # Add all indicators
             df = self.strategy_engine.add_indicators(df)
@@ -152,29 +325,33 @@ class EnhancedSignalGenerator:
             if df.empty or len(df) < 2:
                 return None
             
-            # Check for signal triggers
-            last_row = df.iloc[-1]
-            prev_row = df.iloc[-2]
+            # Last two bars of every column used below, bound once as numpy arrays
+            tail = {c: df[c].to_numpy()[-2:] for c in _SETUP_COLUMNS if c in df.columns}
+            latest = {c: values[-1] for c, values in tail.items()}
+            
+            # Check for signal triggers on the last two bars of each trigger column
+            long_trigger = tail.get('long_trigger', (False, False))
+            short_trigger = tail.get('short_trigger', (False, False))
             
             # Detect signal direction
             signal_direction = None
             
             # Check long trigger
-            if last_row.get('long_trigger', False) and not prev_row.get('long_trigger', False):
+            if long_trigger[-1] and not long_trigger[-2]:
                 signal_direction = 'BUY'
             # Check short trigger
-            elif last_row.get('short_trigger', False) and not prev_row.get('short_trigger', False):
+            elif short_trigger[-1] and not short_trigger[-2]:
                 signal_direction = 'SELL'
             
             if signal_direction is None:
-                logger.info(f"ℹ️ No signal detected for {instrument}")
+                logger.info("ℹ️ No signal detected for %s", instrument)
                 return None
             
             # Extract technical data
-            current_price = last_row['close']
-            atr = last_row.get('atr', 0.001)
-            rsi = last_row.get('rsi', 50)
-            ema_200 = last_row.get('ema_200', current_price)
+            current_price = latest['close']
+            atr = latest.get('atr', 0.001)
+            rsi = latest.get('rsi', 50)
+            ema_200 = latest.get('ema_200', current_price)
             
             # Calculate initial SL/TP (Gemini will optimize these)
             if signal_direction == 'BUY':
@@ -192,13 +369,7 @@ class EnhancedSignalGenerator:
             market_condition = "TRENDING_UP" if current_price > ema_200 else "TRENDING_DOWN"
             
             # Determine session
-            hour = datetime.now().hour
-            if 7 <= hour < 16:
-                session = "LONDON"
-            elif 13 <= hour < 22:
-                session = "NEW_YORK"
-            else:
-                session = "ASIAN"
+            session = _SESSION_BY_HOUR[datetime.now().hour]
             
             raw_signal = {
                 'instrument': instrument,
@@ -216,26 +387,35 @@ class EnhancedSignalGenerator:
                 'technical_data': {
                     'close': current_price,
                     'ema_200': ema_200,
-                    'volume': last_row.get('volume', 0),
-                    'adx': last_row.get('adx', 0)
+                    'volume': latest.get('volume', 0),
+                    'adx': latest.get('adx', 0)
                 }
             }
             
-            logger.info(f"✅ Setup detected: {instrument} {signal_direction} @ {current_price:.5f}")
+            logger.info("✅ Setup detected: %s %s @ %.5f", instrument, signal_direction, current_price)
             return raw_signal
             
         except Exception as e:
             logger.error(f"❌ Error in technical analysis: {e}")
+            self._last_df_ts.pop(instrument, None)  # retry this bar on the next scan
             return None
     
     # ========================================================================
     # STEP 8-9: GEMINI AI CONFIRMATION
     # ========================================================================
     
+    def _fetch_timeframe(self, instrument: str, tf: str, bars: int) -> Optional[pd.DataFrame]:
+        """Fetch one timeframe and add indicators (runs on a worker thread)"""
+        self._oanda_limiter.acquire()
+        df = self.data_handler.fetch_historical_data(instrument, tf, bars)
+        if df is None or df.empty:
+            return df
+        return self.strategy_engine.add_indicators(df)
+    
     def fetch_multi_timeframe_data(self, instrument: str) -> Dict[str, pd.DataFrame]:
         """Fetch data from multiple timeframes for comprehensive analysis"""
         try:
-            logger.info(f"📊 Fetching multi-timeframe data for {instrument}...")
+            logger.info("📊 Fetching multi-timeframe data for %s...", instrument)
             
             timeframes = {
                 'M5': 500,   # Primary timeframe
@@ -246,17 +426,37 @@ class EnhancedSignalGenerator:
             }
             
             mtf_data = {}
+            now = time.monotonic()
             
+            # Serve fresh frames from cache; everything else is fetched below
+            stale = {}
             for tf, bars in timeframes.items():
-                try:
-                    df = self.data_handler.fetch_historical_data(instrument, tf, bars)
-                    if df is not None and not df.empty:
-                        # Add indicators
-                        df = self.strategy_engine.add_indicators(df)
-                        mtf_data[tf] = df
-                        logger.info(f"  ✓ {tf}: {len(df)} bars")
-                except Exception as e:
-                    logger.warning(f"  ✗ {tf}: {e}")
+                cached = self._mtf_cache.get((instrument, tf))
+                if cached is not None and now - cached[0] < MTF_CACHE_TTL[tf]:
+                    mtf_data[tf] = cached[1]
+                    logger.debug("  ✓ %s: %d bars (cached)", tf, len(cached[1]))
+                else:
+                    stale[tf] = bars
+            
+            # Each timeframe is an independent OANDA request - overlap their round trips
+            if stale:
+                with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+                    futures = {
+                        tf: executor.submit(self._fetch_timeframe, instrument, tf, bars)
+                        for tf, bars in stale.items()
+                    }
+                    for tf, future in futures.items():
+                        try:
+                            df = future.result()
+                            if df is not None and not df.empty:
+                                mtf_data[tf] = df
+                                self._mtf_cache[(instrument, tf)] = (now, df)
+                                logger.debug("  ✓ %s: %d bars", tf, len(df))
+                        except Exception as e:
+                            logger.warning(f"  ✗ {tf}: {e}")
+            
+            # Keep the usual M5 -> D1 ordering for the Gemini package
+            mtf_data = {tf: mtf_data[tf] for tf in timeframes if tf in mtf_data}
             
             return mtf_data
             
@@ -272,54 +472,58 @@ class EnhancedSignalGenerator:
         try:
             instrument = raw_signal['instrument']
             
-            # Extract latest indicators from each timeframe
             latest_indicators = {}
-            for tf, df in mtf_data.items():
-                if df is not None and not df.empty:
-                    latest = df.iloc[-1]
-                    latest_indicators[tf] = {
-                        'close': float(latest.get('close', 0)),
-                        'open': float(latest.get('open', 0)),
-                        'high': float(latest.get('high', 0)),
-                        'low': float(latest.get('low', 0)),
-                        'rsi': float(latest.get('rsi', 50)),
-                        'atr': float(latest.get('atr', 0)),
-                        'ema_50': float(latest.get('ema_50', latest.get('close', 0))),
-                        'ema_200': float(latest.get('ema_200', latest.get('close', 0))),
-                        'adx': float(latest.get('adx', 0)),
-                        'volume': int(latest.get('volume', 0))
-                    }
-            
-            # Trend alignment across timeframes
             trend_alignment = {}
-            for tf, df in mtf_data.items():
-                if df is not None and not df.empty:
-                    latest = df.iloc[-1]
-                    close = latest.get('close', 0)
-                    ema_200 = latest.get('ema_200', close)
-                    trend_alignment[tf] = "BULLISH" if close > ema_200 else "BEARISH"
-            
-            # Support/Resistance levels
             sr_levels = {}
-            for tf in ['H4', 'D1']:
-                if tf in mtf_data and mtf_data[tf] is not None:
-                    df = mtf_data[tf].tail(50)
-                    sr_levels[tf] = {
-                        'resistance_levels': df['high'].nlargest(3).tolist(),
-                        'support_levels': df['low'].nsmallest(3).tolist()
-                    }
-            
-            # Price history (recent candles)
             price_history = {}
+            
             for tf, df in mtf_data.items():
-                if df is not None and not df.empty:
-                    recent = df.tail(20)
-                    price_history[tf] = {
-                        'highs': recent['high'].tolist(),
-                        'lows': recent['low'].tolist(),
-                        'closes': recent['close'].tolist(),
-                        'opens': recent['open'].tolist()
+                if df is None:
+                    continue
+                
+                # Raw column arrays, sliced directly instead of via tail()/iloc row Series
+                highs = df['high'].to_numpy(dtype=float)
+                lows = df['low'].to_numpy(dtype=float)
+                
+                # Support/Resistance levels
+                if tf in ('H4', 'D1'):
+                    sr_levels[tf] = {
+                        'resistance_levels': _top_k(highs[-50:], 3, largest=True),
+                        'support_levels': _top_k(lows[-50:], 3, largest=False)
                     }
+                
+                if df.empty:
+                    continue
+                
+                closes = df['close'].to_numpy()
+                opens = df['open'].to_numpy()
+                close = closes[-1]
+                ema_200 = _last_value(df, 'ema_200', close)
+                
+                # Latest indicators
+                latest_indicators[tf] = {
+                    'close': float(close),
+                    'open': float(opens[-1]),
+                    'high': float(highs[-1]),
+                    'low': float(lows[-1]),
+                    'rsi': float(_last_value(df, 'rsi', 50)),
+                    'atr': float(_last_value(df, 'atr', 0)),
+                    'ema_50': float(_last_value(df, 'ema_50', close)),
+                    'ema_200': float(ema_200),
+                    'adx': float(_last_value(df, 'adx', 0)),
+                    'volume': int(_last_value(df, 'volume', 0))
+                }
+                
+                # Trend alignment across timeframes
+                trend_alignment[tf] = "BULLISH" if close > ema_200 else "BEARISH"
+                
+                # Price history (recent candles) - numpy views, serialize with OPT_SERIALIZE_NUMPY
+                price_history[tf] = {
+                    'highs': highs[-20:],
+                    'lows': lows[-20:],
+                    'closes': closes[-20:],
+                    'opens': opens[-20:]
+                }
             
             # Build complete package
             package = {
@@ -354,7 +558,7 @@ class EnhancedSignalGenerator:
                 }
             }
             
-            logger.info(f"📦 Gemini package prepared with {len(mtf_data)} timeframes")
+            logger.info("📦 Gemini package prepared with %d timeframes", len(mtf_data))
             return package
             
         except Exception as e:
@@ -365,120 +569,134 @@ class EnhancedSignalGenerator:
         """
         Steps 8-10: Send signal to Gemini AI for confirmation and optimization
         
+        Runs as linear stages - quick check, throttle, MTF fetch, package,
+        validate - each returning early. Only the validator call is wrapped,
+        since every other stage already handles its own errors.
+        
         Returns:
             Confirmed signal with Gemini's analysis, or None if rejected
         """
-        try:
-            instrument = raw_signal['instrument']
-            
-            if not self.use_gemini:
-                logger.info(f"📊 Auto-approving signal (Gemini disabled)")
-                return self._auto_approve_signal(raw_signal)
-            
-            logger.info(f"🤖 Requesting Gemini AI confirmation for {instrument}...")
-
-            # Quick local quality check BEFORE calling Gemini to reduce API usage
-            try:
-                if getattr(config, 'GEMINI_LOCAL_FILTER_ENABLED', True):
-                    passed = self._quick_quality_check(raw_signal)
-                    if not passed:
-                        logger.info("ℹ️ Local quality check failed — skipping Gemini and auto-approving strategy levels")
-                        return self._auto_approve_signal(raw_signal)
-            except Exception as e:
-                logger.warning(f"⚠️ Local quality check error: {e} — continuing to Gemini")
-
-            # Respect simple throttling between Gemini calls (extra protection vs quotas)
-            try:
-                throttle_sec = getattr(config, 'GEMINI_THROTTLE_SECONDS', 0)
-                if throttle_sec and self._last_gemini_call_ts is not None:
-                    elapsed = (datetime.now() - self._last_gemini_call_ts).total_seconds()
-                    if elapsed < throttle_sec:
-                        wait = throttle_sec - elapsed
-                        logger.info(f"⏳ Throttling Gemini calls: sleeping {wait:.1f}s to respect GEMINI_THROTTLE_SECONDS")
-                        time.sleep(wait)
-            except Exception:
-                # Non-fatal — continue without throttle if something fails
-                pass
-
-            # Fetch multi-timeframe data
-            mtf_data = self.fetch_multi_timeframe_data(instrument)
-            
-            if not mtf_data:
-                logger.warning(f"⚠️ No MTF data - auto-approving with strategy levels")
-                return self._auto_approve_signal(raw_signal)
-            
-            # Prepare comprehensive package
-            gemini_package = self.prepare_gemini_package(raw_signal, mtf_data)
-            
-            # Build validator-friendly payloads and call Gemini (returns approved, data)
-            try:
-                signal_for_validator = {
-                    'symbol': gemini_package.get('symbol'),
-                    'type': gemini_package.get('detected_setup', {}).get('direction'),
-                    'entry_price': gemini_package.get('detected_setup', {}).get('entry_price'),
-                    'current_price': gemini_package.get('detected_setup', {}).get('entry_price'),
-                    'stop_loss': gemini_package.get('initial_levels', {}).get('stop_loss'),
-                    'take_profit': gemini_package.get('initial_levels', {}).get('tp1')
-                }
-
-                market_analysis = {
-                    'rsi': gemini_package.get('current_market_state', {}).get('rsi'),
-                    'adx': gemini_package.get('multi_timeframe_indicators', {}).get('M5', {}).get('adx'),
-                    'trend': gemini_package.get('trend_alignment', {}).get('M5'),
-                    'alma_signal': None,
-                    'volume_status': 'HIGH' if gemini_package.get('multi_timeframe_indicators', {}).get('M5', {}).get('volume', 0) > 0 else 'UNKNOWN'
-                }
+        instrument = raw_signal['instrument']
+        
+        if not self.use_gemini:
+            logger.info("📊 Auto-approving signal (Gemini disabled)")
+            return self._auto_approve_signal(raw_signal)
+        
+        logger.info("🤖 Requesting Gemini AI confirmation for %s...", instrument)
 
-                approved, gemini_data = self.gemini_validator.validate_signal(
-                    signal_for_validator,
-                    market_analysis,
-                    confidence_threshold=0.60
-                )
+        # Quick local quality check BEFORE calling Gemini to reduce API usage
+        if getattr(config, 'GEMINI_LOCAL_FILTER_ENABLED', True) and not self._quick_quality_check(raw_signal):
+            logger.info("ℹ️ Local quality check failed — skipping Gemini and auto-approving strategy levels")
+            return self._auto_approve_signal(raw_signal)
 
-                # Record the last Gemini call timestamp for throttling
-                try:
-                    self._last_gemini_call_ts = datetime.now()
-                except Exception:
-                    pass
+        # Respect simple throttling between Gemini calls (extra protection vs quotas).
+        # A throttled setup is retried on the next scan rather than sleeping here.
+        if not self._reserve_gemini_slot():
+            logger.info("⏳ Gemini throttled - deferring %s to the next scan", instrument)
+            self._last_df_ts.pop(instrument, None)  # let the same bar be re-detected
+            return None
 
-            except Exception as e:
-                logger.error(f"❌ Error calling Gemini validator: {e}")
-                return None
+        # Fetch multi-timeframe data
+        mtf_data = self.fetch_multi_timeframe_data(instrument)
+        
+        if not mtf_data:
+            logger.warning("⚠️ No MTF data - auto-approving with strategy levels")
+            return self._auto_approve_signal(raw_signal)
+        
+        # Prepare comprehensive package
+        gemini_package = self.prepare_gemini_package(raw_signal, mtf_data)
+        signal_for_validator, market_analysis = self._validator_inputs(gemini_package)
+        
+        # Call Gemini (returns approved, data) - the only stage doing network I/O
+        try:
+            approved, gemini_data = self.gemini_validator.validate_signal(
+                signal_for_validator,
+                market_analysis,
+                confidence_threshold=0.60
+            )
+        except Exception as e:
+            logger.error(f"❌ Error calling Gemini validator: {e}")
+            self._last_df_ts.pop(instrument, None)  # retry this bar on the next scan
+            return None
+        finally:
+            self._record_gemini_call()
 
-            # Interpret Gemini result
-            if not approved:
-                logger.warning(f"❌ Gemini REJECTED the signal for {instrument}")
-                return None
+        # Interpret Gemini result
+        if not approved:
+            logger.warning("❌ Gemini REJECTED the signal for %s", instrument)
+            return None
 
-            # If gemini_data is None, validator auto-approved without suggestions — use raw levels
-            gs = gemini_data or {}
+        confirmed_signal = self._build_confirmed_signal(raw_signal, gemini_data)
+        logger.info("✅ Gemini CONFIRMED: %s | Confidence: %s%%", instrument, confirmed_signal['confidence_score'])
+        return confirmed_signal
+    
+    def _reserve_gemini_slot(self) -> bool:
+        """
+        Claim the next Gemini call if GEMINI_THROTTLE_SECONDS have passed since the
+        last one. Returns False instead of sleeping so the scan thread is not held.
+        """
+        throttle_sec = getattr(config, 'GEMINI_THROTTLE_SECONDS', 0)
+        with self._lock:
+            now = time.monotonic()
+            if throttle_sec and self._last_gemini_call_ts is not None:
+                if now - self._last_gemini_call_ts < throttle_sec:
+                    return False
+            self._last_gemini_call_ts = now
+            return True
+    
+    def _record_gemini_call(self):
+        """Record the last Gemini call timestamp for throttling"""
+        with self._lock:
+            self._last_gemini_call_ts = time.monotonic()
+    
+    @staticmethod
+    def _validator_inputs(gemini_package: Dict) -> Tuple[Dict, Dict]:
+        """Build the validator-friendly signal and market payloads from a Gemini package"""
+        setup = gemini_package.get('detected_setup', {})
+        levels = gemini_package.get('initial_levels', {})
+        m5 = gemini_package.get('multi_timeframe_indicators', {}).get('M5', {})
+        
+        signal_for_validator = {
+            'symbol': gemini_package.get('symbol'),
+            'type': setup.get('direction'),
+            'entry_price': setup.get('entry_price'),
+            'current_price': setup.get('entry_price'),
+            'stop_loss': levels.get('stop_loss'),
+            'take_profit': levels.get('tp1')
+        }
 
-            # Build confirmed signal (use Gemini optimized values when present)
-            confirmed_signal = {
-                'symbol': instrument,
-                'direction': gs.get('type', raw_signal['direction']) if gs.get('type') else raw_signal['direction'],
-                'entry': gs.get('optimized_tp', raw_signal['entry_price']) if gs.get('optimized_tp') else raw_signal['entry_price'],
-                'stop_loss': gs.get('optimized_sl', raw_signal['stop_loss']) if gs.get('optimized_sl') else raw_signal['stop_loss'],
-                'tp1': gs.get('optimized_tp', raw_signal['tp1']) if gs.get('optimized_tp') else raw_signal['tp1'],
-                'tp2': gs.get('tp2', raw_signal['tp2']) if gs.get('tp2') else raw_signal['tp2'],
-                'tp3': gs.get('tp3', raw_signal['tp3']) if gs.get('tp3') else raw_signal['tp3'],
-                'confidence_score': gs.get('confidence', 70),
-                'signal_strength': gs.get('signal_strength', 'MEDIUM'),
-                'reasoning': gs.get('reasoning', 'Gemini AI analysis') if gs else 'Gemini auto-approved',
-                'market_condition': raw_signal['market_condition'],
-                'session': raw_signal['session'],
-                'volatility_level': raw_signal['atr'],
-                'rsi': raw_signal['rsi'],
-                'validated_by': 'GEMINI_AI',
-                'timestamp': raw_signal['timestamp']
-            }
-            
-            logger.info(f"✅ Gemini CONFIRMED: {instrument} | Confidence: {confirmed_signal['confidence_score']}%")
-            return confirmed_signal
-            
-        except Exception as e:
-            logger.error(f"❌ Gemini confirmation error: {e}")
-            return None
+        market_analysis = {
+            'rsi': gemini_package.get('current_market_state', {}).get('rsi'),
+            'adx': m5.get('adx'),
+            'trend': gemini_package.get('trend_alignment', {}).get('M5'),
+            'alma_signal': None,
+            'volume_status': 'HIGH' if m5.get('volume', 0) > 0 else 'UNKNOWN'
+        }
+        return signal_for_validator, market_analysis
+    
+    @staticmethod
+    def _build_confirmed_signal(raw_signal: Dict, gemini_data: Optional[Dict]) -> Dict:
+        """Build confirmed signal (use Gemini optimized values when present)"""
+        # If gemini_data is None, validator auto-approved without suggestions — use raw levels
+        gs = gemini_data or {}
+        return {
+            'symbol': raw_signal['instrument'],
+            'direction': gs.get('type') or raw_signal['direction'],
+            'entry': gs.get('optimized_tp') or raw_signal['entry_price'],
+            'stop_loss': gs.get('optimized_sl') or raw_signal['stop_loss'],
+            'tp1': gs.get('optimized_tp') or raw_signal['tp1'],
+            'tp2': gs.get('tp2') or raw_signal['tp2'],
+            'tp3': gs.get('tp3') or raw_signal['tp3'],
+            'confidence_score': gs.get('confidence', 70),
+            'signal_strength': gs.get('signal_strength', 'MEDIUM'),
+            'reasoning': gs.get('reasoning', 'Gemini AI analysis') if gs else 'Gemini auto-approved',
+            'market_condition': raw_signal['market_condition'],
+            'session': raw_signal['session'],
+            'volatility_level': raw_signal['atr'],
+            'rsi': raw_signal['rsi'],
+            'validated_by': 'GEMINI_AI',
+            'timestamp': raw_signal['timestamp']
+        }
     
     def _auto_approve_signal(self, raw_signal: Dict) -> Dict:
         """Auto-approve signal when Gemini is unavailable"""
@@ -550,7 +768,7 @@ class EnhancedSignalGenerator:
 
             # Compute normalized score
             threshold = getattr(config, 'GEMINI_LOCAL_SCORE_THRESHOLD', 3)
-            logger.debug(f"Local quality score: {score}/{weight_total} (threshold {threshold})")
+            logger.debug("Local quality score: %s/%s (threshold %s)", score, weight_total, threshold)
             return score >= threshold
         except Exception as e:
             logger.warning(f"⚠️ Quick quality check failed: {e}")
@@ -569,35 +787,18 @@ class EnhancedSignalGenerator:
         Returns:
             Signal ID if saved successfully, None otherwise
         """
+        if self._SessionLocal is None:
+            logger.error("❌ Error saving signal: database not initialized")
+            return None
+        
         try:
-            from sqlalchemy import create_engine
-            from sqlalchemy.orm import sessionmaker
-            from database.signal_models import Base as SignalBase
-            
-            # Get database URL from environment
-            database_url = os.getenv("DATABASE_URL", "sqlite:///./trading_signals.db")
-            
-            # Configure engine based on database type
-            if database_url.startswith('postgresql'):
-                engine = create_engine(
-                    database_url,
-                    pool_pre_ping=True,
-                    pool_recycle=300
-                )
-            else:
-                engine = create_engine(
-                    database_url,
-                    connect_args={"check_same_thread": False}
-                )
-            
-            SignalSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-            db = SignalSessionLocal()
-            
-            # Create signal
-            signal = SignalCRUD.create_signal(db, confirmed_signal)
-            signal_id = signal.id
-            
-            db.close()
+            db = self._SessionLocal()
+            try:
+                # Create signal
+                signal = SignalCRUD.create_signal(db, confirmed_signal)
+                signal_id = signal.id
+            finally:
+                db.close()
             
             logger.info(f"💾 Signal saved to database: ID={signal_id} | {confirmed_signal['symbol']} {confirmed_signal['direction']}")
             logger.info(f"📱 Signal now visible on Frontend UI - User can add to journal")
@@ -630,13 +831,11 @@ class EnhancedSignalGenerator:
             logger.info(f"{'='*70}")
             
             # Check cooldown
-            if instrument in self.last_signal_time:
-                elapsed = (datetime.now() - self.last_signal_time[instrument]).total_seconds() / 60
-                if elapsed < self.cooldown_minutes:
-                    logger.info(f"⏳ Cooldown active: {elapsed:.1f}/{self.cooldown_minutes} min")
-                    return False
+            if self._cooldown_active(instrument):
+                return False
             
             # Fetch data
+            self._oanda_limiter.acquire()
             df = self.data_handler.fetch_historical_data(
                 instrument,
                 self.timeframe,
@@ -663,12 +862,19 @@ class EnhancedSignalGenerator:
                 logger.info(f"❌ Signal not confirmed by Gemini")
                 return False
             
+            # Another scan or worker may have confirmed the same instrument meanwhile
+            if not self._claim_cooldown(instrument):
+                logger.info(f"⏳ Cooldown claimed elsewhere for {instrument} - not saving duplicate")
+                return False
+            
             # STEP 11: Save to Database
             signal_id = self.save_confirmed_signal(confirmed_signal)
             
-            if signal_id:
-                self.last_signal_time[instrument] = datetime.now()
-                
+            if not signal_id:
+                # Free the cooldown and the bar mark so the next scan retries the save
+                self._release_cooldown(instrument)
+                self._last_df_ts.pop(instrument, None)
+            else:
                 logger.info(f"\n{'='*70}")
                 logger.info(f"🎯 SUCCESS! Signal Generated & Confirmed")
                 logger.info(f"{'='*70}")
@@ -697,6 +903,16 @@ class EnhancedSignalGenerator:
             traceback.print_exc()
             return False
     
+    def _scan_instruments(self) -> Dict[str, bool]:
+        """
+        Run process_instrument for every instrument concurrently.
+        Each scan is dominated by OANDA and Gemini HTTP waits, so threads overlap them.
+        """
+        max_workers = min(len(self.instruments), 8) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = executor.map(self.process_instrument, self.instruments)
+            return dict(zip(self.instruments, outcomes))
+    
     def run_continuous(self, scan_interval: int = 60):
         """
         Continuous signal generation loop
@@ -712,38 +928,38 @@ class EnhancedSignalGenerator:
         logger.info("="*70 + "\n")
         
         cycle = 0
+        self._stop.clear()
         
         try:
-            while True:
+            while not self._stop.is_set():
                 cycle += 1
                 logger.info(f"\n🔄 SCAN CYCLE #{cycle} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                 
-                signals_generated = 0
-                
-                for instrument in self.instruments:
-                    if self.process_instrument(instrument):
-                        signals_generated += 1
-                    time.sleep(2)
+                results = self._scan_instruments()
+                signals_generated = sum(1 for success in results.values() if success)
                 
                 logger.info(f"\n📊 Cycle #{cycle} Complete: {signals_generated} new signals")
                 logger.info(f"⏳ Next scan in {scan_interval} seconds...\n")
                 
-                time.sleep(scan_interval)
+                # Wakes immediately on stop() instead of sleeping the full interval
+                self._stop.wait(scan_interval)
+            
+            logger.info("\n\n⚠️ Stopped")
                 
         except KeyboardInterrupt:
             logger.info("\n\n⚠️ Stopped by user")
     
+    def stop(self):
+        """Ask run_continuous to exit after the current cycle"""
+        self._stop.set()
+    
     def run_single_scan(self):
         """Single scan across all instruments"""
         logger.info("\n" + "="*70)
         logger.info("🎯 ENHANCED SIGNAL GENERATOR - SINGLE SCAN")
         logger.info("="*70 + "\n")
         
-        results = {}
-        
-        for instrument in self.instruments:
-            results[instrument] = self.process_instrument(instrument)
-            time.sleep(2)
+        results = self._scan_instruments()
         
         logger.info("\n" + "="*70)
         logger.info("📊 SCAN RESULTS:")
@@ -781,6 +997,8 @@ def main():
     
     # Run
     if args.mode == 'continuous':
+        # Docker/systemd stop with SIGTERM - finish the cycle and exit cleanly
+        signal.signal(signal.SIGTERM, lambda signum, frame: generator.stop())
         generator.run_continuous(scan_interval=args.interval)
     else:
         generator.run_single_scan()
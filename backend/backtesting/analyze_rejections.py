@@ -1,58 +1,95 @@
 #!/usr/bin/env python3
 """Quick script to analyze rejection patterns from the report."""
-import json
-
-with open('reports/rejected_signals_2025-11-12.json', 'r') as f:
-    data = json.load(f)
-
-print("\n" + "="*60)
-print("REJECTION ANALYSIS - 2025-11-12")
-print("="*60)
-
-print(f"\nTotal Rejections: {data['summary']['total']}")
-print(f"By Reason: {data['summary']['by_reason']}")
-print(f"By Instrument: {data['summary']['by_instrument']}")
-
-print("\n" + "-"*60)
-print("SAMPLE REJECTION DETAILS (First 6)")
-print("-"*60)
-
-for i, r in enumerate(data['rejections'][:6], 1):
-    m = r['metrics']
-    print(f"\n{i}. {r['instrument']} @ {r['hour']:02d}:00")
-    print(f"   Regime: {r['regime']}")
-    print(f"   Reason: {r['reason']}")
-    print(f"   Filter reasons: {', '.join(m.get('filter_reasons', ['N/A']))}")
-    print(f"   Strength: {m.get('strength', 'N/A')}%")
-    print(f"   Buy votes: {m.get('buy_votes', 'N/A')}, Sell votes: {m.get('sell_votes', 'N/A')}")
-    print(f"   ADX: {m.get('adx', 'N/A')}, ATR%: {m.get('atr_pct', 'N/A')}")
-    print(f"   Volatility OK: {m.get('volatility_ok')}, Strength OK: {m.get('strength_ok')}, ADX OK: {m.get('adx_ok')}")
-
-print("\n" + "="*60)
-print("THRESHOLD ANALYSIS")
-print("="*60)
+import re
+import sys
+from operator import itemgetter
+
+import orjson
+
+# One line per filter reason in the joined text; '^' anchors each pattern to a
+# line start, so a reason counts at most once per bucket however often it matches
+REASON_PATTERNS = {
+    'strength': re.compile(r'^.*?strength too weak', re.I | re.M),
+    'volatility': re.compile(r'^.*?volatility', re.I | re.M),
+    'adx': re.compile(r'^.*?(?:adx|weak trend)', re.I | re.M),
+    'no_signal': re.compile(r'^.*?no signal', re.I | re.M),
+}
+
+# Number of rejections to print in full (optional first argument, default 6)
+SAMPLE_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+
+# Fields every rejection has, fetched in one call. generator_error/exception
+# entries carry no regime or metrics, so those two are read with .get()
+get_sample = itemgetter('instrument', 'hour', 'reason')
+METRIC_DEFAULTS = {
+    'filter_reasons': ['N/A'],
+    'strength': 'N/A',
+    'buy_votes': 'N/A',
+    'sell_votes': 'N/A',
+    'adx': 'N/A',
+    'atr_pct': 'N/A',
+    'volatility_ok': None,
+    'strength_ok': None,
+    'adx_ok': None,
+}
+get_metrics = itemgetter(*METRIC_DEFAULTS)
+
+with open('reports/rejected_signals_2025-11-12.json', 'rb') as f:
+    data = orjson.loads(f.read())
+
+# Collect the report and write it to stdout in one go at the end
+lines = []
+out = lines.append
+
+out("\n" + "="*60)
+out("REJECTION ANALYSIS - 2025-11-12")
+out("="*60)
+
+out(f"\nTotal Rejections: {data['summary']['total']}")
+out(f"By Reason: {data['summary']['by_reason']}")
+out(f"By Instrument: {data['summary']['by_instrument']}")
+
+out("\n" + "-"*60)
+out(f"SAMPLE REJECTION DETAILS (First {SAMPLE_SIZE})")
+out("-"*60)
+
+for i, r in enumerate(data['rejections'][:SAMPLE_SIZE], 1):
+    instrument, hour, reason = get_sample(r)
+    regime = r.get('regime', 'N/A')
+    m = r.get('metrics') or {}
+    (filter_reasons, strength, buy_votes, sell_votes, adx, atr_pct,
+     volatility_ok, strength_ok, adx_ok) = get_metrics({**METRIC_DEFAULTS, **m})
+    out(f"\n{i}. {instrument} @ {hour:02d}:00")
+    out(f"   Regime: {regime}")
+    out(f"   Reason: {reason}")
+    out(f"   Filter reasons: {', '.join(filter_reasons)}")
+    out(f"   Strength: {strength}%")
+    out(f"   Buy votes: {buy_votes}, Sell votes: {sell_votes}")
+    out(f"   ADX: {adx}, ATR%: {atr_pct}")
+    out(f"   Volatility OK: {volatility_ok}, Strength OK: {strength_ok}, ADX OK: {adx_ok}")
+
+out("\n" + "="*60)
+out("THRESHOLD ANALYSIS")
+out("="*60)
 
 # Count specific rejection patterns
-strength_fails = 0
-volatility_fails = 0
-adx_fails = 0
-no_signal = 0
-
-for r in data['rejections']:
-    reasons = r['metrics'].get('filter_reasons', [])
-    for reason in reasons:
-        if 'strength too weak' in reason.lower():
-            strength_fails += 1
-        if 'volatility' in reason.lower():
-            volatility_fails += 1
-        if 'adx' in reason.lower() or 'weak trend' in reason.lower():
-            adx_fails += 1
-        if 'no signal' in reason.lower():
-            no_signal += 1
-
-print(f"\nStrength failures: {strength_fails}")
-print(f"Volatility failures: {volatility_fails}")
-print(f"ADX/Trend failures: {adx_fails}")
-print(f"No signal generated: {no_signal}")
-
-print("\n" + "="*60 + "\n")
+reasons_text = '\n'.join(
+    reason
+    for r in data['rejections']
+    for reason in r.get('metrics', {}).get('filter_reasons', ())
+)
+counts = {bucket: len(pattern.findall(reasons_text)) for bucket, pattern in REASON_PATTERNS.items()}
+
+strength_fails = counts['strength']
+volatility_fails = counts['volatility']
+adx_fails = counts['adx']
+no_signal = counts['no_signal']
+
+out(f"\nStrength failures: {strength_fails}")
+out(f"Volatility failures: {volatility_fails}")
+out(f"ADX/Trend failures: {adx_fails}")
+out(f"No signal generated: {no_signal}")
+
+out("\n" + "="*60 + "\n")
+
+sys.stdout.write('\n'.join(lines) + '\n')
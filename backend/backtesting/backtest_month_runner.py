@@ -9,12 +9,86 @@ Usage:
   - Optionally run via the PowerShell helper script in the repo root
 """
 import asyncio
-import json
+import orjson
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from oandapyV20 import API
+
+try:
+    import uvloop  # optional faster event loop for the concurrent fetches (no Windows support)
+except ImportError:
+    uvloop = None
+
 from backtest_oanda import OANDABacktestEngine
 
+# Per-instrument metrics copied into the aggregated summary, in output order
+SUMMARY_KEYS = (
+    "final_balance",
+    "net_profit",
+    "return_pct",
+    "total_trades",
+    "win_rate",
+    "profit_factor",
+    "max_drawdown",
+)
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _run_backtest_in_process(api_key, instrument, start_date, end_date, risk_per_trade,
+                             engine_kwargs, per_file):
+    """Worker-process entry point: its own engine, OANDA client and event loop"""
+    print(f"\n=== Running backtest for {instrument} ({start_date} -> {end_date}) ===")
+    engine = OANDABacktestEngine(api_key=api_key, **engine_kwargs)
+    results = asyncio.run(engine.run_backtest(
+        instrument=instrument,
+        start_date=start_date,
+        end_date=end_date,
+        risk_per_trade=risk_per_trade,
+        focus_date=None,
+    ))
+    if results:
+        engine.save_results(results, per_file)
+    return instrument, results
+
+
+async def _run_in_loop(api_key, instruments, start_date, end_date, risk_per_trade,
+                       engine_kwargs, results_file):
+    """Run every instrument as a task on this event loop; returns (instrument, results) pairs"""
+    # Engines keep per-run ledgers, so each instrument gets its own, but they all
+    # share one OANDA client and its HTTP connection pool
+    api = API(access_token=api_key, environment="practice")
+
+    # Instruments are independent and mostly wait on OANDA, so run them side by side;
+    # the semaphore keeps the number of concurrent candle fetches within API limits.
+    sem = asyncio.Semaphore(int(os.getenv("BACKTEST_CONCURRENCY", "4")))
+
+    async def _run_one(instrument):
+        async with sem:
+            print(f"\n=== Running backtest for {instrument} ({start_date} -> {end_date}) ===")
+            engine = OANDABacktestEngine(api_key=api_key, api=api, **engine_kwargs)
+
+            results = await engine.run_backtest(
+                instrument=instrument,
+                start_date=start_date,
+                end_date=end_date,
+                risk_per_trade=risk_per_trade,
+                focus_date=None,
+            )
+
+            # Save per-instrument results off the event loop
+            if results:
+                await asyncio.to_thread(engine.save_results, results, results_file(instrument))
+            return instrument, results
+
+    # gather keeps the input order, so the summary lists instruments as given
+    return await asyncio.gather(*(_run_one(instrument) for instrument in instruments))
+
 
 async def run_month_backtest(
     instruments,
@@ -44,39 +118,37 @@ async def run_month_backtest(
         "instruments": {},
     }
 
-    for instrument in instruments:
-        print(f"\n=== Running backtest for {instrument} ({start_date} -> {end_date}) ===")
-        engine = OANDABacktestEngine(
-            api_key=api_key,
-            initial_balance=initial_balance,
-            min_votes_required=min_votes_required,
-            min_strength=min_strength,
-        )
-
-        results = await engine.run_backtest(
-            instrument=instrument,
-            start_date=start_date,
-            end_date=end_date,
-            risk_per_trade=risk_per_trade,
-            focus_date=None,
-        )
+    engine_kwargs = {
+        "initial_balance": initial_balance,
+        "min_votes_required": min_votes_required,
+        "min_strength": min_strength,
+        "candle_cache_dir": os.path.join(results_dir, "_cache"),
+    }
 
-        # Save per-instrument results and collect key metrics
+    def _results_file(instrument):
+        return os.path.join(results_dir, f"backtest_results_{instrument}_{timestamp}.json")
+
+    # The per-bar signal loop is CPU-bound; BACKTEST_PROCESSES > 0 runs each
+    # instrument in its own worker process so instruments use separate cores.
+    processes = int(os.getenv("BACKTEST_PROCESSES", "0"))
+    if processes > 0:
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            pairs = await asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, _run_backtest_in_process, api_key, instrument, start_date, end_date,
+                    risk_per_trade, engine_kwargs, _results_file(instrument)
+                )
+                for instrument in instruments
+            ))
+    else:
+        pairs = await _run_in_loop(api_key, instruments, start_date, end_date, risk_per_trade,
+                                   engine_kwargs, _results_file)
+
+    # Collect key metrics
+    for instrument, results in pairs:
         if results:
-            per_file = os.path.join(
-                results_dir, f"backtest_results_{instrument}_{timestamp}.json"
-            )
-            engine.save_results(results, per_file)
-
-            aggregated["instruments"][instrument] = {
-                "final_balance": results.get("final_balance"),
-                "net_profit": results.get("net_profit"),
-                "return_pct": results.get("return_pct"),
-                "total_trades": results.get("total_trades"),
-                "win_rate": results.get("win_rate"),
-                "profit_factor": results.get("profit_factor"),
-                "max_drawdown": results.get("max_drawdown"),
-            }
+            aggregated["instruments"][instrument] = {key: results.get(key) for key in SUMMARY_KEYS}
         else:
             aggregated["instruments"][instrument] = {
                 "error": "No results (possibly no data or no trades)"
@@ -86,11 +158,12 @@ async def run_month_backtest(
     summary_file = os.path.join(
         results_dir, f"backtest_summary_{start_date}_to_{end_date}_{timestamp}.json"
     )
-    with open(summary_file, "w") as f:
-        json.dump(aggregated, f, indent=2)
+    # Encode once for both the file and the console; write off the event loop
+    summary_bytes = orjson.dumps(aggregated, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    await asyncio.to_thread(_write_bytes, summary_file, summary_bytes)
 
     print("\n=== Aggregated Summary ===")
-    print(json.dumps(aggregated, indent=2))
+    print(summary_bytes.decode())
     print(f"\nSaved summary to: {summary_file}")
 
 
@@ -112,4 +185,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
+import orjson
 import os
 import sys
 from oandapyV20 import API
@@ -19,17 +20,28 @@ load_dotenv()
 
 # Import our enhanced strategy
 from enhanced_signal_generator import EnhancedSignalGenerator
+from utils.candles import GRANULARITY_MINUTES, candles_to_frame
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Column reducers for resampling OHLCV bars to a higher timeframe
+OHLCV_AGG = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
 
 class OANDABacktestEngine:
     """
     Backtest AlphaForge strategy using OANDA historical data.
     """
     
-    def __init__(self, api_key=None, initial_balance=10000, min_votes_required=2.5, min_strength=40.0):
+    def __init__(self, api_key=None, initial_balance=10000, min_votes_required=2.5, min_strength=40.0,
+                 candle_cache_dir=None, fetch_concurrency=4, api=None):
         """
         Initialize backtest engine.
         
@@ -38,12 +50,18 @@ class OANDABacktestEngine:
             initial_balance: Starting account balance
             min_votes_required: Minimum indicator votes for signal (2.0-3.0)
             min_strength: Minimum signal strength percentage (30.0-50.0)
+            candle_cache_dir: Optional directory where downloaded candles are kept per
+                instrument/granularity and extended incrementally across runs
+            fetch_concurrency: Maximum candle requests in flight at once
+            api: Optional oandapyV20 API client to share (and its connection pool) across engines
         """
         self.api_key = api_key or os.getenv("OANDA_API_KEY")
-        self.api = API(access_token=self.api_key, environment="practice")
+        self.api = api or API(access_token=self.api_key, environment="practice")
         self.initial_balance = initial_balance
         self.min_votes_required = min_votes_required
         self.min_strength = min_strength
+        self.candle_cache_dir = candle_cache_dir
+        self.fetch_concurrency = fetch_concurrency
         
         # Trading parameters
         self.balance = initial_balance
@@ -65,11 +83,16 @@ class OANDABacktestEngine:
         # Ensure engine settings match backtest config
         self.signal_generator.mtf_engine.min_votes_required = min_votes_required
         self.signal_generator.mtf_engine.min_strength = min_strength
+        # One client for candle history and MTF analysis
+        self.signal_generator.mtf_engine.api = self.api
         
     async def fetch_historical_data(self, instrument, start_date, end_date, granularity='M5'):
         """
         Fetch historical candle data from OANDA.
         
+        With candle_cache_dir set, candles are kept per (instrument, granularity)
+        on disk and only the part of the range not already cached is downloaded.
+        
         Args:
             instrument: Trading pair (e.g., 'GBP_USD')
             start_date: Start date (datetime or string 'YYYY-MM-DD')
@@ -87,100 +110,106 @@ class OANDABacktestEngine:
         if isinstance(end_date, str):
             end_date = datetime.strptime(end_date, '%Y-%m-%d')
         
-        all_candles = []
-        current_date = start_date
+        # OANDA rejects a 'to' in the future, so stop at the current (UTC) time
+        fetch_end = min(end_date, datetime.utcnow())
         
-        # OANDA limits to 5000 candles per request
-        max_candles = 5000
+        if not self.candle_cache_dir:
+            df, _ = await self._fetch_range(instrument, start_date, fetch_end, granularity)
+            logger.info(f"Total candles fetched: {len(df)}")
+            return df
         
-        while current_date < end_date:
-            # Calculate candles needed for this chunk
-            days_remaining = (end_date - current_date).days
-            
-            # Adjust count based on granularity
-            if granularity == 'M5':
-                candles_per_day = 288  # 24 * 60 / 5
-            elif granularity == 'M15':
-                candles_per_day = 96   # 24 * 60 / 15
-            elif granularity == 'H1':
-                candles_per_day = 24
-            else:
-                candles_per_day = 288  # Default
-            
-            count = min(max_candles, int(days_remaining * candles_per_day))
-            
+        # Candles are immutable history - only download what is missing on either side
+        cache_path = os.path.join(self.candle_cache_dir, f"{instrument}_{granularity}.pkl")
+        cached = pd.read_pickle(cache_path) if os.path.exists(cache_path) else None
+        if cached is None or cached.empty:
+            missing = [(start_date, fetch_end)]
+        else:
+            bar = timedelta(minutes=GRANULARITY_MINUTES.get(granularity, 5))
+            first, last = cached.index[0].to_pydatetime(), cached.index[-1].to_pydatetime()
+            # Extend from the cached edges (not the request edges) so the cache stays gap-free
+            missing = [(lo, hi) for lo, hi in ((start_date, first), (last + bar, fetch_end)) if lo < hi]
+        
+        frames = [] if cached is None else [cached]
+        downloaded = 0
+        fetch_failed = False
+        for lo, hi in missing:
+            part, failed = await self._fetch_range(instrument, lo, hi, granularity)
+            fetch_failed |= failed
+            if not part.empty:
+                frames.append(part)
+                downloaded += len(part)
+        
+        if not frames:
+            return pd.DataFrame()
+        candles = pd.concat(frames) if len(frames) > 1 else frames[0]
+        if missing:
+            candles = candles[~candles.index.duplicated()].sort_index()
+            # Don't cache a range that was cut short by an API error
+            if not fetch_failed:
+                os.makedirs(self.candle_cache_dir, exist_ok=True)
+                candles.to_pickle(cache_path)
+        
+        df = candles[(candles.index >= start_date) & (candles.index < fetch_end)]
+        logger.info(f"Total candles: {len(df)} ({downloaded} downloaded)")
+        return df
+    
+    async def _fetch_range(self, instrument, start_date, end_date, granularity):
+        """
+        Download [start_date, end_date) from OANDA.
+        
+        Returns:
+            (DataFrame, True if any request failed)
+        """
+        # OANDA limits to 5000 candles per request - split the range into windows
+        # that each fit in one request and fetch them side by side
+        max_candles = 5000
+        span = timedelta(minutes=GRANULARITY_MINUTES.get(granularity, 5) * max_candles)
+        windows = []
+        window_start = start_date
+        while window_start < end_date:
+            window_end = min(window_start + span, end_date)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        
+        sem = asyncio.Semaphore(self.fetch_concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def fetch_window(window_start, window_end):
             params = {
                 "granularity": granularity,
-                "count": count,
-                "from": current_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "from": window_start.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "to": window_end.strftime('%Y-%m-%dT%H:%M:%SZ'),
                 "price": "M"  # Midpoint pricing
             }
-            
-            try:
-                request = InstrumentsCandles(instrument=instrument, params=params)
-                
+            request = InstrumentsCandles(instrument=instrument, params=params)
+            async with sem:
                 # Run synchronous API call in executor
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.api.request(request)
-                )
-                
-                candles = response.get('candles', [])
-                
-                if not candles:
-                    break
-                
-                all_candles.extend(candles)
-                
-                # Update current_date to last candle time
-                last_time = candles[-1]['time'].replace('.000000000Z', '')
-                current_date = datetime.strptime(last_time, '%Y-%m-%dT%H:%M:%S')
-                current_date += timedelta(minutes=5)  # Move forward
-                
-                logger.info(f"Fetched {len(candles)} candles, total: {len(all_candles)}")
-                
-                # Sleep to avoid rate limits
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error fetching data: {e}")
-                break
-        
-        # Process candles into DataFrame
-        df = self._process_candles(all_candles)
-        logger.info(f"Total candles fetched: {len(df)}")
-        
-        return df
-    
-    def _process_candles(self, candles):
-        """Convert OANDA candles to DataFrame."""
-        data = []
+                response = await loop.run_in_executor(None, self.api.request, request)
+            candles = response.get('candles', [])
+            logger.info(f"Fetched {len(candles)} candles from {params['from']}")
+            return candles
+        
+        pages = await asyncio.gather(
+            *(fetch_window(*window) for window in windows),
+            return_exceptions=True
+        )
         
-        for candle in candles:
-            if not candle.get('complete', False):
+        all_candles = []
+        fetch_failed = False
+        for page in pages:
+            if isinstance(page, Exception):
+                logger.error(f"Error fetching data: {page}")
+                fetch_failed = True
                 continue
-            
-            time_str = candle['time'].replace('.000000000Z', '')
-            timestamp = datetime.strptime(time_str, '%Y-%m-%dT%H:%M:%S')
-            
-            mid = candle.get('mid', candle.get('bid', candle.get('ask')))
-            
-            data.append({
-                'timestamp': timestamp,
-                'open': float(mid['o']),
-                'high': float(mid['h']),
-                'low': float(mid['l']),
-                'close': float(mid['c']),
-                'volume': int(candle['volume'])
-            })
-        
-        df = pd.DataFrame(data)
+            all_candles.extend(page)
+        
+        # Process candles into DataFrame
+        df = candles_to_frame(all_candles)
         if not df.empty:
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
+            # Window edges can return the same bar twice
+            df = df[~df.index.duplicated()]
         
-        return df
+        return df, fetch_failed
     
     async def run_backtest(self, instrument, start_date, end_date, risk_per_trade=0.02, focus_date=None):
         """
@@ -213,22 +242,10 @@ class OANDABacktestEngine:
             logger.error("No data fetched!")
             return None
         
-        # Prepare multi-timeframe data
-        df_m15 = df.resample('15T').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }).dropna()
-        
-        df_h1 = df.resample('1H').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }).dropna()
+        # Prepare multi-timeframe data. H1 is rolled up from the M15 bars (a third
+        # of the rows) - first/max/min/last/sum compose, so the result is the same.
+        df_m15 = df.resample('15min').agg(OHLCV_AGG).dropna()
+        df_h1 = df_m15.resample('1h').agg(OHLCV_AGG).dropna()
         
         # Simulate trading
         logger.info("Running backtest simulation...")
@@ -238,34 +255,41 @@ class OANDABacktestEngine:
         signals_generated = 0
         signals_filtered = 0
         
-        for i in range(lookback, len(df)):
+        # Precompute what each bar needs instead of rescanning the frames per bar:
+        # closes as a plain array, and for every M5 bar the number of M15/H1 bars
+        # at or before it (one searchsorted over the whole index)
+        closes = df['close'].to_numpy()
+        m15_end = df_m15.index.searchsorted(df.index, side='right')
+        h1_end = df_h1.index.searchsorted(df.index, side='right')
+        # A focus date narrows the loop to that day's bars up front; positions
+        # are only managed on bars the loop visits
+        if focus_date:
+            focus_start = pd.Timestamp(datetime.strptime(focus_date, '%Y-%m-%d'))
+            scan_start, scan_end = df.index.searchsorted(
+                [focus_start, focus_start + pd.Timedelta(days=1)]
+            )
+        else:
+            scan_start, scan_end = 0, len(df)
+        exit_at = None
+        
+        for i in range(max(lookback, scan_start), scan_end):
             current_time = df.index[i]
-            current_price = df['close'].iloc[i]
+            current_price = closes[i]
             
-            # Skip if focus_date is set and this isn't the focus date
-            if focus_date:
-                focus_dt = datetime.strptime(focus_date, '%Y-%m-%d').date()
-                if current_time.date() != focus_dt:
+            # Check for open position management - its exit bar is already known
+            if self.open_position:
+                if exit_at is None or i < exit_at[0]:  # Still open
                     continue
+                self._close_trade(exit_at[1], current_time, exit_at[2])
+                exit_at = None
             
-            # Get data up to current point
-            m5_data = df.iloc[:i+1].tail(500)
-            m15_data = df_m15[df_m15.index <= current_time].tail(300)
-            h1_data = df_h1[df_h1.index <= current_time].tail(200)
-            
-            # Prepare multi-timeframe data
+            # Get data up to current point (positional slices, no boolean masks)
             mtf_data = {
-                'M5': m5_data,
-                'M15': m15_data,
-                'H1': h1_data
+                'M5': df.iloc[i - 499:i + 1],
+                'M15': df_m15.iloc[max(m15_end[i] - 300, 0):m15_end[i]],
+                'H1': df_h1.iloc[max(h1_end[i] - 200, 0):h1_end[i]]
             }
             
-            # Check for open position management
-            if self.open_position:
-                self._update_position(current_price, current_time)
-                if self.open_position:  # Still open
-                    continue
-            
             # Generate signal
             # Generate signal using the ACTUAL signal generator logic
             # This ensures we test regime detection, cooldowns, and all filters exactly as live
@@ -314,6 +338,8 @@ class OANDABacktestEngine:
                         risk_per_trade,
                         trade_data
                     )
+                    if self.open_position:
+                        exit_at = self._find_exit(closes, i + 1, scan_end)
         
         # Close any remaining position
         if self.open_position:
@@ -374,28 +400,31 @@ class OANDABacktestEngine:
             f"Size: {position_size:.2f} | Strength: {signal_data['strength']:.1f}%"
         )
     
-    def _update_position(self, current_price, current_time):
-        """Update open position and check for exit."""
-        if not self.open_position:
-            return
+    def _find_exit(self, closes, start, end):
+        """
+        Find where the open position exits within closes[start:end] in one
+        vectorised pass: the first close at/through the stop loss or take profit
+        (stop loss wins when both hold, as the old per-bar check did).
         
+        Returns:
+            (bar index, exit price, reason), or None if it stays open
+        """
         pos = self.open_position
-        
-        # Check stop loss
+        window = closes[start:end]
         if pos['direction'] == 'BUY':
-            if current_price <= pos['stop_loss']:
-                self._close_trade(pos['stop_loss'], current_time, "Stop Loss")
-                return
-            elif current_price >= pos['take_profit']:
-                self._close_trade(pos['take_profit'], current_time, "Take Profit")
-                return
+            sl_hit = window <= pos['stop_loss']
+            tp_hit = window >= pos['take_profit']
         else:  # SELL
-            if current_price >= pos['stop_loss']:
-                self._close_trade(pos['stop_loss'], current_time, "Stop Loss")
-                return
-            elif current_price <= pos['take_profit']:
-                self._close_trade(pos['take_profit'], current_time, "Take Profit")
-                return
+            sl_hit = window >= pos['stop_loss']
+            tp_hit = window <= pos['take_profit']
+        
+        hit = sl_hit | tp_hit
+        if not hit.any():
+            return None
+        k = int(hit.argmax())
+        if sl_hit[k]:
+            return start + k, pos['stop_loss'], "Stop Loss"
+        return start + k, pos['take_profit'], "Take Profit"
     
     def _close_trade(self, exit_price, exit_time, reason):
         """Close the open trade."""
@@ -467,9 +496,6 @@ class OANDABacktestEngine:
             logger.warning("No trades executed!")
             return None
         
-        # Convert trades to DataFrame
-        trades_df = pd.DataFrame(self.trades)
-        
         # Calculate metrics
         win_rate = (self.winning_trades / self.total_trades) * 100 if self.total_trades > 0 else 0
         avg_win = self.total_profit / self.winning_trades if self.winning_trades > 0 else 0
@@ -498,7 +524,7 @@ class OANDABacktestEngine:
             'profit_factor': profit_factor,
             'max_drawdown': self.max_drawdown * 100,
             'expectancy': expectancy,
-            'trades': trades_df.to_dict('records')
+            'trades': self.trades  # already one dict per trade - no DataFrame round trip
         }
         
         return results
@@ -548,18 +574,17 @@ class OANDABacktestEngine:
         if not results:
             return
         
-        # Convert datetime objects to strings
+        # Convert datetime objects to strings (on copies - the caller keeps its trades)
         results_copy = results.copy()
         results_copy['start_date'] = str(results_copy['start_date'])
         results_copy['end_date'] = str(results_copy['end_date'])
+        results_copy['trades'] = [
+            {**trade, 'entry_time': str(trade['entry_time']), 'exit_time': str(trade['exit_time'])}
+            for trade in results['trades']
+        ]
         
-        # Convert trades DataFrame records
-        for trade in results_copy['trades']:
-            trade['entry_time'] = str(trade['entry_time'])
-            trade['exit_time'] = str(trade['exit_time'])
-        
-        with open(filename, 'w') as f:
-            json.dump(results_copy, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(results_copy, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         logger.info(f"Results saved to {filename}")
 
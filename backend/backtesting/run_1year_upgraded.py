@@ -1,6 +1,8 @@
 import asyncio
 import os
 import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from backtest_oanda import OANDABacktestEngine
@@ -11,6 +13,46 @@ load_dotenv()
 logging.basicConfig(level=logging.WARNING)  # Less verbose for long test
 logger = logging.getLogger(__name__)
 
+# Shared with the monthly runner - reruns only download candles newer than the cache
+CANDLE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "backtest_results", "_cache")
+
+def report_instrument(instrument, results):
+    """Print one instrument's results and save them to JSON."""
+    print(f"\n{'='*80}")
+    print(f"{instrument} RESULTS (1 YEAR):")
+    print(f"  Final Balance: ${results['final_balance']:,.2f}")
+    print(f"  Net Profit: ${results['net_profit']:+,.2f}")
+    print(f"  Return: {results['return_pct']:+.2f}%")
+    print(f"  Total Trades: {results['total_trades']}")
+    print(f"  Win Rate: {results['win_rate']:.2f}%")
+    print(f"  Profit Factor: {results['profit_factor']:.2f}")
+    print(f"  Max Drawdown: {results['max_drawdown']:.2f}%")
+    print(f"  Avg Win: ${results['avg_win']:.2f}")
+    print(f"  Avg Loss: ${results['avg_loss']:.2f}")
+    
+    # Win Rate Assessment
+    if results['win_rate'] >= 50:
+        print(f"  ✅ WIN RATE TARGET MET: {results['win_rate']:.2f}% >= 50%")
+    else:
+        print(f"  ⚠️  Win Rate: {results['win_rate']:.2f}% (Target: 50%+)")
+    
+    # Drawdown Assessment
+    if results['max_drawdown'] < 10:
+        print(f"  ✅ DRAWDOWN TARGET MET: {results['max_drawdown']:.2f}% < 10%")
+    else:
+        print(f"  ⚠️  Max Drawdown: {results['max_drawdown']:.2f}% (Target: <10%)")
+    
+    # Save to file
+    filename = f"backtest_UPGRADED_{instrument}_1YEAR.json"
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(
+            results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=str  # pandas Timestamps and other leftovers
+        ))
+    print(f"\n  📄 Results saved to {filename}")
+
+
 async def run_1year_upgraded_test():
     """Run 1-year backtest with UPGRADED system."""
     
@@ -38,60 +80,35 @@ async def run_1year_upgraded_test():
     print(f"  • Min Strength: 35% (was 30%)")
     print("="*80)
     
-    all_results = {}
+    # Each instrument's candle windows go through run_in_executor; give the three
+    # concurrent backtests enough threads for all their fetches to overlap
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=12))
     
-    for instrument in instruments:
-        print(f"\n{'='*80}")
-        print(f"Testing {instrument} (This will take several minutes)...")
-        print(f"{'='*80}")
-        
+    async def run_one(instrument):
         try:
-            engine = OANDABacktestEngine(api_key, initial_balance=10000)
+            engine = OANDABacktestEngine(api_key, initial_balance=10000, candle_cache_dir=CANDLE_CACHE_DIR)
             
             # Run backtest
-            results = await engine.run_backtest(
+            return await engine.run_backtest(
                 instrument=instrument,
                 start_date=start_date.strftime('%Y-%m-%d'),
                 end_date=end_date.strftime('%Y-%m-%d')
             )
-            
-            if results:
-                all_results[instrument] = results
-                
-                # Display results
-                print(f"\n{instrument} RESULTS (1 YEAR):")
-                print(f"  Final Balance: ${results['final_balance']:,.2f}")
-                print(f"  Net Profit: ${results['net_profit']:+,.2f}")
-                print(f"  Return: {results['return_pct']:+.2f}%")
-                print(f"  Total Trades: {results['total_trades']}")
-                print(f"  Win Rate: {results['win_rate']:.2f}%")
-                print(f"  Profit Factor: {results['profit_factor']:.2f}")
-                print(f"  Max Drawdown: {results['max_drawdown']:.2f}%")
-                print(f"  Avg Win: ${results['avg_win']:.2f}")
-                print(f"  Avg Loss: ${results['avg_loss']:.2f}")
-                
-                # Win Rate Assessment
-                if results['win_rate'] >= 50:
-                    print(f"  ✅ WIN RATE TARGET MET: {results['win_rate']:.2f}% >= 50%")
-                else:
-                    print(f"  ⚠️  Win Rate: {results['win_rate']:.2f}% (Target: 50%+)")
-                
-                # Drawdown Assessment
-                if results['max_drawdown'] < 10:
-                    print(f"  ✅ DRAWDOWN TARGET MET: {results['max_drawdown']:.2f}% < 10%")
-                else:
-                    print(f"  ⚠️  Max Drawdown: {results['max_drawdown']:.2f}% (Target: <10%)")
-                
-                # Save to file
-                filename = f"backtest_UPGRADED_{instrument}_1YEAR.json"
-                import json
-                with open(filename, 'w') as f:
-                    json.dump(results, f, indent=2, default=str)
-                print(f"\n  📄 Results saved to {filename}")
-                
         except Exception as e:
             print(f"  ❌ Error testing {instrument}: {e}")
             logger.error(f"Backtest error for {instrument}: {e}", exc_info=True)
+            return None
+    
+    # The instruments are independent - run them together, report in order
+    print(f"\nTesting {', '.join(instruments)} concurrently (This will take several minutes)...")
+    outcomes = await asyncio.gather(*(run_one(instrument) for instrument in instruments))
+    
+    all_results = {}
+    
+    for instrument, results in zip(instruments, outcomes):
+        if results:
+            all_results[instrument] = results
+            report_instrument(instrument, results)
     
     # Summary
     print(f"\n{'='*80}")
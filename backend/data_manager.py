@@ -5,19 +5,24 @@ import logging
 from oandapyV20 import API
 from oandapyV20.endpoints.instruments import InstrumentsCandles
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.candles import GRANULARITY_MINUTES, candles_to_frame
 
 logger = logging.getLogger(__name__)
 
+
 class DataManager:
     """
     Manages historical data fetching and caching to avoid repeated API calls.
     Supports saving/loading to Parquet (efficient) or CSV.
     """
     
-    def __init__(self, api_key, cache_dir='data_cache'):
+    def __init__(self, api_key, cache_dir='data_cache', fetch_concurrency=4):
         self.api_key = api_key
         self.api = API(access_token=self.api_key, environment="practice")
         self.cache_dir = cache_dir
+        self.fetch_concurrency = fetch_concurrency  # parallel OANDA requests per fetch
         
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
@@ -61,65 +66,40 @@ class DataManager:
         dt_start = datetime.strptime(start_date, '%Y-%m-%d')
         dt_end = datetime.strptime(end_date, '%Y-%m-%d')
         
-        all_candles = []
-        current = dt_start
+        # OANDA limits to 5000 candles per request - the windows don't depend on
+        # each other's responses, so compute them up front and fetch side by side
+        max_candles = 5000
+        span = timedelta(minutes=GRANULARITY_MINUTES.get(granularity, 5) * max_candles)
+        windows = []
+        window_start = dt_start
+        while window_start < dt_end:
+            window_end = min(window_start + span, dt_end)
+            windows.append((window_start, window_end))
+            window_start = window_end
         
-        while current < dt_end:
-            # OANDA limit
-            count = 5000
-            
+        def fetch_window(window):
             params = {
                 "granularity": granularity,
-                "count": count,
-                "from": current.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "from": window[0].strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "to": window[1].strftime('%Y-%m-%dT%H:%M:%SZ'),
                 "price": "M"
             }
-            
             try:
                 r = InstrumentsCandles(instrument=instrument, params=params)
                 self.api.request(r)
-                candles = r.response.get('candles', [])
-                
-                if not candles:
-                    break
-                    
-                all_candles.extend(candles)
-                
-                # Update current time
-                last_time = candles[-1]['time'].replace('.000000000Z', '')
-                current = datetime.strptime(last_time, '%Y-%m-%dT%H:%M:%S') + timedelta(minutes=5)
-                
+                return r.response.get('candles', [])
             except Exception as e:
                 logger.error(f"API Error: {e}")
-                break
-                
-        return self._process_candles(all_candles)
-
-    def _process_candles(self, candles):
-        """Convert OANDA candles to DataFrame."""
-        data = []
-        for candle in candles:
-            if not candle.get('complete', False):
-                continue
+                return []
+        
+        all_candles = []
+        with ThreadPoolExecutor(max_workers=self.fetch_concurrency) as pool:
+            for candles in pool.map(fetch_window, windows):
+                all_candles.extend(candles)
                 
-            time_str = candle['time'].replace('.000000000Z', '')
-            
-            mid = candle.get('mid', {})
-            data.append({
-                'timestamp': datetime.strptime(time_str, '%Y-%m-%dT%H:%M:%S'),
-                'open': float(mid.get('o', 0)),
-                'high': float(mid.get('h', 0)),
-                'low': float(mid.get('l', 0)),
-                'close': float(mid.get('c', 0)),
-                'volume': int(candle.get('volume', 0))
-            })
-            
-        df = pd.DataFrame(data)
+        # Partial payloads are tolerated here; window edges can repeat a bar
+        df = candles_to_frame(all_candles, strict_mid=False)
         if not df.empty:
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
-            
-            # Ensure no duplicates
             df = df[~df.index.duplicated(keep='first')]
             
         return df
@@ -24,7 +24,7 @@ try:
         engine = create_engine(
             database_url,
             pool_pre_ping=True,
-            pool_recycle=300,
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
             pool_size=10,
             max_overflow=20,
             echo=False  # Set to True for debugging
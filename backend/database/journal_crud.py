@@ -1,10 +1,43 @@
 """
 CRUD operations for Trading Journal
 """
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List, Optional
 from .journal_models import JournalEntry, TradeType, SessionType, TradeOutcomeJournal
+from .keyset import keyset_older_than
+
+
+# Columns labelled with the keys JournalEntry.to_dict() produces
+_ENTRY_DICT_COLUMNS = (
+    JournalEntry.id.label('id'),
+    JournalEntry.open_time.label('openTime'),
+    JournalEntry.close_time.label('closeTime'),
+    JournalEntry.symbol.label('symbol'),
+    JournalEntry.trade_type.label('type'),
+    JournalEntry.lots.label('lots'),
+    JournalEntry.entry_price.label('entry'),
+    JournalEntry.exit_price.label('exit'),
+    JournalEntry.stop_loss.label('sl'),
+    JournalEntry.take_profit.label('tp'),
+    JournalEntry.pips.label('pips'),
+    JournalEntry.profit_loss.label('pl'),
+    JournalEntry.mae.label('mae'),
+    JournalEntry.mfe.label('mfe'),
+    JournalEntry.r_value.label('r'),
+    JournalEntry.trade_setup.label('setup'),
+    JournalEntry.session.label('session'),
+    JournalEntry.duration_minutes.label('duration'),
+    JournalEntry.notes.label('notes'),
+    JournalEntry.tags.label('tags'),
+    JournalEntry.screenshot_entry.label('screenshot_entry'),
+    JournalEntry.screenshot_exit.label('screenshot_exit'),
+    JournalEntry.screenshot_analysis.label('screenshot_analysis'),
+    JournalEntry.outcome.label('outcome'),
+    JournalEntry.created_at.label('created_at'),
+    JournalEntry.updated_at.label('updated_at'),
+)
 
 
 class JournalCRUD:
@@ -17,7 +50,7 @@ class JournalCRUD:
         if 'open_time' in entry_data:
             if isinstance(entry_data['open_time'], str) and entry_data['open_time']:
                 try:
-                    entry_data['open_time'] = datetime.fromisoformat(entry_data['open_time'].replace('Z', '+00:00'))
+                    entry_data['open_time'] = datetime.fromisoformat(entry_data['open_time'])
                 except:
                     try:
                         entry_data['open_time'] = datetime.strptime(entry_data['open_time'], '%Y-%m-%dT%H:%M')
@@ -29,7 +62,7 @@ class JournalCRUD:
         if 'close_time' in entry_data:
             if isinstance(entry_data['close_time'], str) and entry_data['close_time']:
                 try:
-                    entry_data['close_time'] = datetime.fromisoformat(entry_data['close_time'].replace('Z', '+00:00'))
+                    entry_data['close_time'] = datetime.fromisoformat(entry_data['close_time'])
                 except:
                     try:
                         entry_data['close_time'] = datetime.strptime(entry_data['close_time'], '%Y-%m-%dT%H:%M')
@@ -65,14 +98,50 @@ class JournalCRUD:
         return db.query(JournalEntry).filter(JournalEntry.id == entry_id).first()
     
     @staticmethod
-    def get_all_entries(db: Session, skip: int = 0, limit: int = 1000) -> List[JournalEntry]:
-        """Get all journal entries with pagination"""
-        return db.query(JournalEntry)\
-            .order_by(JournalEntry.open_time.desc())\
-            .offset(skip)\
+    def get_all_entries(
+        db: Session,
+        skip: int = 0,
+        limit: int = 1000,
+        cursor: Optional[int] = None
+    ) -> List[JournalEntry]:
+        """
+        Get journal entries newest first. Pass the id of the last entry already
+        seen as `cursor` to seek straight to the next page instead of OFFSET.
+        """
+        query = db.query(JournalEntry)
+        if cursor is not None:
+            query = query.filter(keyset_older_than(JournalEntry, JournalEntry.open_time, cursor))
+        elif skip:
+            query = query.offset(skip)
+        return query\
+            .order_by(JournalEntry.open_time.desc(), JournalEntry.id.desc())\
             .limit(limit)\
             .all()
     
+    @staticmethod
+    def list_dicts(db: Session, limit: int = 1000, cursor: Optional[int] = None) -> List[dict]:
+        """
+        Same page as get_all_entries, but as plain dicts straight from a Core
+        SELECT, skipping ORM instance construction. Output matches
+        JournalEntry.to_dict(); enums are left native for orjson to serialize.
+        """
+        stmt = select(*_ENTRY_DICT_COLUMNS)\
+            .order_by(JournalEntry.open_time.desc(), JournalEntry.id.desc())\
+            .limit(limit)
+        if cursor is not None:
+            stmt = stmt.where(keyset_older_than(JournalEntry, JournalEntry.open_time, cursor))
+        
+        entries = []
+        for row in db.execute(stmt).mappings():
+            entry = dict(row)
+            if entry['openTime']:
+                entry['openTime'] = entry['openTime'].strftime('%Y-%m-%d %H:%M')
+            if entry['closeTime']:
+                entry['closeTime'] = entry['closeTime'].strftime('%Y-%m-%d %H:%M')
+            entry['duration'] = f"{entry['duration']} min" if entry['duration'] else None
+            entries.append(entry)
+        return entries
+    
     @staticmethod
     def get_entries_by_date_range(
         db: Session,
@@ -0,0 +1,17 @@
+"""
+Keyset pagination helpers shared by the CRUD modules
+"""
+from sqlalchemy import and_, or_, select
+
+
+def keyset_older_than(model, ts_col, cursor: int):
+    """
+    Keyset filter for rows after `cursor` in (ts_col DESC, id DESC) order.
+    The cursor row's time is looked up in the same statement, so pages
+    cost one indexed seek no matter how deep they go.
+    """
+    cursor_ts = select(ts_col).where(model.id == cursor).scalar_subquery()
+    return or_(
+        ts_col < cursor_ts,
+        and_(ts_col == cursor_ts, model.id < cursor)
+    )
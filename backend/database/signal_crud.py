@@ -4,8 +4,9 @@ CRUD operations for trading signals database
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select
 from .signal_models import TradingSignal, TradeAnalytics, SignalStatus, TradeOutcome
+from .keyset import keyset_older_than
 
 
 class SignalCRUD:
@@ -26,9 +27,49 @@ class SignalCRUD:
         return db.query(TradingSignal).filter(TradingSignal.id == signal_id).first()
     
     @staticmethod
-    def get_all_signals(db: Session, skip: int = 0, limit: int = 100) -> List[TradingSignal]:
-        """Get all signals with pagination"""
-        return db.query(TradingSignal).order_by(TradingSignal.timestamp.desc()).offset(skip).limit(limit).all()
+    def get_all_signals(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None
+    ) -> List[TradingSignal]:
+        """Get all signals with pagination (pass the last seen id as `cursor` instead of `skip`)"""
+        query = db.query(TradingSignal)
+        if cursor is not None:
+            query = query.filter(keyset_older_than(TradingSignal, TradingSignal.timestamp, cursor))
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(TradingSignal.timestamp.desc(), TradingSignal.id.desc()).limit(limit).all()
+    
+    @staticmethod
+    def list_dicts(
+        db: Session,
+        limit: Optional[int] = 100,
+        since: Optional[datetime] = None,
+        symbol: Optional[str] = None,
+        cursor: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Get signals as plain dicts straight from a Core SELECT, skipping ORM
+        instance construction. Keys match TradingSignal.to_dict(); datetimes and
+        enums are left native for orjson to serialize.
+        """
+        stmt = select(TradingSignal.__table__).order_by(TradingSignal.timestamp.desc(), TradingSignal.id.desc())
+        if cursor is not None:
+            stmt = stmt.where(keyset_older_than(TradingSignal, TradingSignal.timestamp, cursor))
+        if since is not None:
+            stmt = stmt.where(TradingSignal.timestamp >= since)
+        if symbol is not None:
+            stmt = stmt.where(TradingSignal.symbol == symbol)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+    
+    @staticmethod
+    def count_by_status(db: Session) -> Dict[SignalStatus, int]:
+        """Count signals per status in a single GROUP BY query"""
+        rows = db.query(TradingSignal.status, func.count(TradingSignal.id)).group_by(TradingSignal.status).all()
+        return {status: count for status, count in rows}
     
     @staticmethod
     def get_signals_by_status(db: Session, status: SignalStatus) -> List[TradingSignal]:
@@ -2,7 +2,7 @@
 Database models for trading signals and trade tracking
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Index, Enum as SQLEnum
 from sqlalchemy.ext.declarative import declarative_base
 import enum
 
@@ -91,6 +91,11 @@ class TradingSignal(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        # Recent-signal listings filtered/grouped by status
+        Index('idx_timestamp_status', timestamp.desc(), status),
+    )
+    
     def __repr__(self):
         return f"<TradingSignal {self.id}: {self.symbol} {self.direction} @ {self.entry} - {self.status}>"
     
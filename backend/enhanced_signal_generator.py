@@ -52,12 +52,15 @@ class EnhancedSignalGenerator:
         self.min_confidence = 0.4  # Minimum multi-timeframe confidence (was 0.6)
         self.min_agreement = 0.5  # Minimum 2/3 timeframe agreement (ORIGINAL)
         
-    async def generate_signal(self, instrument='GBP_USD'):
+    async def generate_signal(self, instrument='GBP_USD', timestamp=None, provided_data=None):
         """
         Generate trading signal with full AlphaForge enhancement.
         
         Args:
             instrument: GBP_USD, XAU_USD, or USD_JPY
+            timestamp: Bar time to evaluate at (backtests); defaults to now
+            provided_data: Optional {'M5': df, 'M15': df, 'H1': df} candles to use
+                           instead of fetching from OANDA (backtests pass window slices)
         
         Returns:
             dict: Complete signal with regime, MTF analysis, position sizing
@@ -66,10 +69,15 @@ class EnhancedSignalGenerator:
             logger.error(f"Unsupported instrument: {instrument}")
             return None
         
+        now = timestamp or datetime.now()
+        
         try:
-            # Step 1: Fetch multi-timeframe data
-            logger.info(f"Fetching multi-timeframe data for {instrument}...")
-            mtf_data = await self.mtf_engine.fetch_multi_timeframe(instrument)
+            # Step 1: Fetch multi-timeframe data (unless the caller already has it)
+            if provided_data is not None:
+                mtf_data = provided_data
+            else:
+                logger.info(f"Fetching multi-timeframe data for {instrument}...")
+                mtf_data = await self.mtf_engine.fetch_multi_timeframe(instrument)
             
             if not mtf_data or 'M5' not in mtf_data:
                 logger.error(f"Failed to fetch data for {instrument}")
@@ -92,13 +100,14 @@ class EnhancedSignalGenerator:
                     'regime': regime.value,
                     'reason': 'Unfavorable market regime',
                     'tradeable': False,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now.isoformat()
                 }
             
             # Step 4: Generate multi-timeframe signal WITH REGIME
             mtf_signal = self.mtf_engine.generate_multi_timeframe_signal(
                 mtf_data, 
-                regime.value  # Pass regime for adaptive thresholds
+                regime.value,  # Pass regime for adaptive thresholds
+                instrument=instrument
             )
             
             logger.info(
@@ -150,7 +159,7 @@ class EnhancedSignalGenerator:
                     'proposed_entry': current_price,
                     'proposed_stop_loss': proposed_sl,
                     'proposed_take_profit': proposed_tp,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now.isoformat()
                 }
             
             # Step 6: Check signal strength (align with engine's lowered threshold)
@@ -169,7 +178,7 @@ class EnhancedSignalGenerator:
                     'proposed_entry': current_price,
                     'proposed_stop_loss': proposed_sl,
                     'proposed_take_profit': proposed_tp,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now.isoformat()
                 }
             
             if mtf_signal['agreement'] < self.min_agreement:
@@ -181,7 +190,7 @@ class EnhancedSignalGenerator:
                     'reason': 'Poor timeframe agreement',
                     'mtf_signal': mtf_signal,
                     'tradeable': False,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now.isoformat()
                 }
             
             # Step 7: Calculate position sizing parameters
@@ -192,7 +201,7 @@ class EnhancedSignalGenerator:
             recommended_risk = kelly_fraction * position_multiplier
             
             # Step 8: Get session weight
-            current_hour = datetime.utcnow().hour
+            current_hour = timestamp.hour if timestamp else datetime.utcnow().hour
             session_weight = self._get_session_weight(current_hour)
             
             # Step 9: Calculate final signal strength (already calculated by voting system)
@@ -250,7 +259,7 @@ class EnhancedSignalGenerator:
                 
                 # Metadata
                 'tradeable': True,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
                 'candles_analyzed': {
                     tf: len(df) for tf, df in mtf_data.items()
                 }
@@ -3,9 +3,10 @@ Optimized Gemini AI Signal Validator
 Fast, efficient validation with caching and rate limiting
 """
 import os
-import json
+import orjson
 import logging
 import time
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from functools import lru_cache
@@ -44,6 +45,12 @@ class GeminiSignalValidator:
         self.last_call_time = 0
         self.min_call_interval = 2.0  # seconds between calls
         
+        # The signal generator validates instruments from several threads;
+        # cap in-flight calls and guard the rate limiter and cache state
+        self.max_concurrent_calls = 2
+        self._call_slots = threading.BoundedSemaphore(self.max_concurrent_calls)
+        self._lock = threading.Lock()
+        
         # Response cache (avoid duplicate validations)
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes cache TTL
@@ -143,51 +150,52 @@ class GeminiSignalValidator:
         self.cache_misses += 1
             
         try:
-            # Rate limiting
-            self._apply_rate_limit()
+            with self._call_slots:
+                # Rate limiting
+                self._apply_rate_limit()
             
-            # Build concise validation prompt
-            prompt = self._build_optimized_prompt(signal_data, market_analysis)
+                # Build concise validation prompt
+                prompt = self._build_optimized_prompt(signal_data, market_analysis)
             
-            # Call Gemini API
-            logger.info(f"🤖 Validating with Gemini...")
+                # Call Gemini API
+                logger.info(f"🤖 Validating with Gemini...")
             
-            try:
-                response = self.model.generate_content(prompt)
-            except Exception as api_error:
-                # Check if it's a quota/rate limit error
-                error_msg = str(api_error).lower()
-                if 'quota' in error_msg or 'rate' in error_msg or 'limit' in error_msg or '429' in error_msg:
-                    logger.warning(f"⚠️ {self.current_model_tier} quota exceeded, upgrading to 2.5-pro...")
+                try:
+                    response = self.model.generate_content(prompt)
+                except Exception as api_error:
+                    # Check if it's a quota/rate limit error
+                    error_msg = str(api_error).lower()
+                    if 'quota' in error_msg or 'rate' in error_msg or 'limit' in error_msg or '429' in error_msg:
+                        logger.warning(f"⚠️ {self.current_model_tier} quota exceeded, upgrading to 2.5-pro...")
                     
-                    # Try Pro model as fallback for quota issues
-                    try:
-                        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+                        # Try Pro model as fallback for quota issues
+                        try:
+                            from google.generativeai.types import HarmCategory, HarmBlockThreshold
                         
-                        pro_model = genai.GenerativeModel(
-                            self.pro_model_name,
-                            generation_config={
-                                "temperature": 0.3,
-                                "top_p": 0.8,
-                                "top_k": 20,
-                                "max_output_tokens": 300,
-                            },
-                            safety_settings={
-                                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                            }
-                        )
-                        logger.info(f"✅ Switched to 2.5-pro (quota fallback)")
-                        response = pro_model.generate_content(prompt)
-                        self.model = pro_model  # Use Pro for rest of session
-                        self.current_model_tier = "2.5-pro"
-                    except Exception as pro_error:
-                        logger.error(f"❌ Pro model also failed: {pro_error}")
-                        return True, None
-                else:
-                    raise api_error
+                            pro_model = genai.GenerativeModel(
+                                self.pro_model_name,
+                                generation_config={
+                                    "temperature": 0.3,
+                                    "top_p": 0.8,
+                                    "top_k": 20,
+                                    "max_output_tokens": 300,
+                                },
+                                safety_settings={
+                                    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+                                    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+                                    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+                                    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+                                }
+                            )
+                            logger.info(f"✅ Switched to 2.5-pro (quota fallback)")
+                            response = pro_model.generate_content(prompt)
+                            self.model = pro_model  # Use Pro for rest of session
+                            self.current_model_tier = "2.5-pro"
+                        except Exception as pro_error:
+                            logger.error(f"❌ Pro model also failed: {pro_error}")
+                            return True, None
+                    else:
+                        raise api_error
             
             # Check if response was blocked
             if not response.candidates or not response.candidates[0].content.parts:
@@ -267,37 +275,40 @@ Respond in this exact JSON structure:
     
     def _get_cached_result(self, cache_key: str) -> Optional[Dict]:
         """Get cached validation result if not expired"""
-        if cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            age = (datetime.now() - timestamp).total_seconds()
-            
-            if age < self.cache_ttl:
-                return cached_data
-            else:
-                # Expired, remove from cache
-                del self.cache[cache_key]
+        with self._lock:
+            if cache_key in self.cache:
+                cached_data, timestamp = self.cache[cache_key]
+                age = (datetime.now() - timestamp).total_seconds()
+                
+                if age < self.cache_ttl:
+                    return cached_data
+                else:
+                    # Expired, remove from cache
+                    del self.cache[cache_key]
         
         return None
     
     def _cache_result(self, cache_key: str, result: Dict):
         """Cache validation result"""
-        self.cache[cache_key] = (result, datetime.now())
-        
-        # Clean old cache entries (keep max 100)
-        if len(self.cache) > 100:
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][1])
-            del self.cache[oldest_key]
+        with self._lock:
+            self.cache[cache_key] = (result, datetime.now())
+            
+            # Clean old cache entries (keep max 100)
+            if len(self.cache) > 100:
+                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][1])
+                del self.cache[oldest_key]
     
     def _apply_rate_limit(self):
         """Apply rate limiting between API calls"""
-        elapsed = time.time() - self.last_call_time
+        # Reserve the next call slot under the lock, then sleep outside it
+        with self._lock:
+            now = time.time()
+            wait_time = max(self.min_call_interval - (now - self.last_call_time), 0)
+            self.last_call_time = now + wait_time
         
-        if elapsed < self.min_call_interval:
-            wait_time = self.min_call_interval - elapsed
+        if wait_time:
             logger.debug(f"⏳ Rate limit: waiting {wait_time:.1f}s")
             time.sleep(wait_time)
-        
-        self.last_call_time = time.time()
     
     def get_stats(self) -> Dict:
         """Get validator statistics"""
@@ -332,7 +343,7 @@ Respond in this exact JSON structure:
                 text = '\n'.join(json_lines)
             
             # Parse JSON
-            data = json.loads(text)
+            data = orjson.loads(text)
             
             # Validate required fields
             required = ['confidence', 'approved', 'optimized_sl', 'optimized_tp']
@@ -342,7 +353,7 @@ Respond in this exact JSON structure:
             
             return data
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"❌ Failed to parse Gemini JSON: {e}")
             logger.debug(f"Response text: {response_text}")
             return None
@@ -6,14 +6,67 @@ Supports: GBP/USD, XAU/USD (Gold), USD/JPY
 import asyncio
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
 from datetime import datetime
 import logging
+import threading
 from oandapyV20 import API
 from oandapyV20.endpoints.instruments import InstrumentsCandles
 import os
 
+from utils.candles import candles_to_frame
+
 logger = logging.getLogger(__name__)
 
+# Columns _calculate_indicators adds to a candle frame
+INDICATOR_COLUMNS = (
+    'ema5', 'ema8', 'ema13', 'rsi7', 'macd', 'macd_signal', 'macd_hist',
+    'bb_middle', 'bb_upper', 'bb_lower', 'bb_position', 'stoch_k', 'stoch_d',
+    'adx', 'atr', 'atr_pct', 'volume_avg', 'volume_ratio'
+)
+
+
+class IndicatorCache:
+    """
+    Bounded LRU of indicator columns per candle window, shared by every engine.
+    
+    Windows are identified by instrument, granularity, length, first/last
+    timestamp and first/last close, so the same window maps to one entry no
+    matter which engine or parameter set asks for it. In a backtest the M15
+    and H1 windows stay the same for several consecutive M5 bars.
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(df, instrument, granularity):
+        """Identify a candle window without hashing its contents."""
+        close = df['close'].to_numpy()
+        return (instrument, granularity, len(df), df.index[0], df.index[-1], close[0], close[-1])
+    
+    def get(self, key):
+        """Return the cached {column: array} for a window, or None."""
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is not None:
+                self._entries.move_to_end(key)
+            return columns
+    
+    def set(self, key, columns):
+        """Store a window's indicator columns, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = columns
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+indicator_cache = IndicatorCache()
+
+
 class MultiTimeframeEngine:
     """
     Fetches and analyzes multiple timeframes for enhanced signal generation.
@@ -102,7 +155,7 @@ class MultiTimeframeEngine:
             # DEBUG: Print fetch details
             candles = response.get('candles', [])
             print(f"DEBUG: Fetched {len(candles)} candles for {instrument} {granularity} (to={params.get('to')})")
-            df = self._process_candles(candles)
+            df = candles_to_frame(candles)
             
             logger.info(f"Fetched {len(df)} {granularity} candles for {instrument}")
             return df
@@ -111,46 +164,6 @@ class MultiTimeframeEngine:
             logger.error(f"Error fetching {instrument} {granularity}: {e}")
             return None
 
-    def _process_candles(self, candles):
-        """
-        Convert OANDA API candles to DataFrame.
-        
-        Args:
-            candles: List of candle dicts from OANDA
-        
-        Returns:
-            DataFrame: Processed OHLCV data
-        """
-        data = []
-        
-        for candle in candles:
-            # Skip incomplete candles
-            if not candle.get('complete', False):
-                continue
-            
-            # Extract timestamp
-            time_str = candle['time'].replace('.000000000Z', '')
-            timestamp = datetime.strptime(time_str, '%Y-%m-%dT%H:%M:%S')
-            
-            # Extract OHLCV (midpoint pricing)
-            mid = candle.get('mid', candle.get('bid', candle.get('ask')))
-            
-            data.append({
-                'timestamp': timestamp,
-                'open': float(mid['o']),
-                'high': float(mid['h']),
-                'low': float(mid['l']),
-                'close': float(mid['c']),
-                'volume': int(candle['volume'])
-            })
-        
-        df = pd.DataFrame(data)
-        if not df.empty:
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
-        
-        return df
-
     async def fetch_multi_timeframe(self, instrument, to_time=None):
         """
         Fetch all timeframes (M5, M15, H1) in parallel.
@@ -202,12 +215,14 @@ class MultiTimeframeEngine:
         
         return data
 
-    def _calculate_indicators(self, df):
+    def _calculate_indicators(self, df, instrument=None, granularity=None):
         """
         Calculate AlphaForge-style fast indicators.
         
         Args:
             df: DataFrame with OHLCV data
+            instrument: Trading pair the candles belong to (enables the indicator cache)
+            granularity: Timeframe of the candles, e.g. 'M5' (enables the indicator cache)
         
         Returns:
             DataFrame: With indicators added
@@ -215,6 +230,17 @@ class MultiTimeframeEngine:
         if df is None or len(df) < 50:
             return df
         
+        # Same window already computed (here or by another engine) - reattach
+        # copies so later edits to the frame can't reach the cached arrays
+        cache_key = None
+        if instrument and granularity:
+            cache_key = IndicatorCache.key(df, instrument, granularity)
+            cached = indicator_cache.get(cache_key)
+            if cached is not None:
+                for column, values in cached.items():
+                    df[column] = values.copy()
+                return df
+        
         # EMA Ribbon (5-8-13) - Ultra-fast trend detection
         df['ema5'] = df['close'].ewm(span=5, adjust=False).mean()
         df['ema8'] = df['close'].ewm(span=8, adjust=False).mean()
@@ -272,15 +298,20 @@ class MultiTimeframeEngine:
         df['volume_avg'] = df['volume'].rolling(window=20).mean()
         df['volume_ratio'] = df['volume'] / df['volume_avg']
         
+        if cache_key is not None:
+            indicator_cache.set(cache_key, {column: df[column].to_numpy(copy=True) for column in INDICATOR_COLUMNS})
+        
         return df
 
-    def analyze_timeframe(self, df, market_regime='unknown'):
+    def analyze_timeframe(self, df, market_regime='unknown', instrument=None, granularity=None):
         """
         AlphaForge-style indicator voting system.
         
         Args:
             df: DataFrame with OHLCV data
             market_regime: Current market regime for adaptive thresholds
+            instrument: Trading pair the candles belong to (for the indicator cache)
+            granularity: Timeframe of the candles (for the indicator cache)
         
         Returns:
             dict: {
@@ -302,7 +333,7 @@ class MultiTimeframeEngine:
             }
         
         # Calculate indicators
-        df = self._calculate_indicators(df)
+        df = self._calculate_indicators(df, instrument, granularity)
         
         # Get latest values
         latest = df.iloc[-1]
@@ -467,7 +498,7 @@ class MultiTimeframeEngine:
             }
         }
 
-    def generate_multi_timeframe_signal(self, instrument_data, market_regime='unknown'):
+    def generate_multi_timeframe_signal(self, instrument_data, market_regime='unknown', instrument=None):
         """
         Generate AlphaForge-style multi-indicator voting signal.
         
@@ -478,6 +509,8 @@ class MultiTimeframeEngine:
                 'H1': DataFrame
             }
             market_regime: Current market regime for adaptive thresholds
+            instrument: Trading pair the data belongs to (lets repeated windows
+                        reuse cached indicators)
         
         Returns:
             dict: {
@@ -513,7 +546,7 @@ class MultiTimeframeEngine:
         for tf_key, df in instrument_data.items():
             if df is not None and not df.empty:
                 # Analyze with indicator voting
-                analysis = self.analyze_timeframe(df, market_regime)
+                analysis = self.analyze_timeframe(df, market_regime, instrument, tf_key)
                 weight = self.timeframes[tf_key]['weight']
                 
                 tf_signals[tf_key] = {
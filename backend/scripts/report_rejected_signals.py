@@ -8,7 +8,7 @@ Outputs a JSON report with per-hour, per-instrument rejections including:
 Report saved to: backend/reports/rejected_signals_{YYYY-MM-DD}.json
 """
 import asyncio
-import json
+import orjson
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -16,6 +16,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from enhanced_signal_generator import EnhancedSignalGenerator
+from utils.rejection_reports import write_csv_sidecar
 
 
 async def collect_rejections_for_yesterday():
@@ -118,12 +119,12 @@ async def collect_rejections_for_yesterday():
                     "reason": f"exception: {e}",
                 })
 
-    # Save report
-    reports_dir = Path(__file__).parent / "reports"
+    # Save report (and its CSV form) where the API serves them from
+    reports_dir = Path(__file__).resolve().parent.parent / "reports"
     reports_dir.mkdir(parents=True, exist_ok=True)
     out_path = reports_dir / f"rejected_signals_{y_date}.json"
-    with open(out_path, "w") as f:
-        json.dump(report, f, indent=2)
+    out_path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    write_csv_sidecar(out_path, report)
 
     # Print concise summary for terminal
     print("\n=== Rejected Signals Summary ===")
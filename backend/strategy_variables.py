@@ -125,6 +125,13 @@ GEMINI_LOCAL_SCORE_THRESHOLD = 4
 # Simple throttle (seconds) between Gemini API calls (adds extra protection)
 GEMINI_THROTTLE_SECONDS = 2
 
+# ============================================================================
+# OANDA REQUEST BUDGET (Signal generator scan loop)
+# ============================================================================
+# Candle requests per second shared by all instrument scans. Bursts up to this
+# many go straight through; only sustained load beyond it is paced.
+OANDA_REQUESTS_PER_SECOND = 10
+
 # ============================================================================
 # STRATEGY PRESETS (Quick configurations)
 # ============================================================================
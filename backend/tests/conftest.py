@@ -0,0 +1,59 @@
+"""
+Shared setup for the API tests
+Points the app at a throwaway database before anything imports it and
+provides one seeded TestClient for the whole session.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Point the app at a throwaway database before it is imported
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test_signals.db')}"
+
+SEED_ROWS = 50
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import app as api
+    from database.signal_models import TradingSignal, SignalStatus
+    from database.journal_models import JournalEntry, TradeType, TradeOutcomeJournal
+
+    db = api.SessionLocal()
+    now = datetime.utcnow()
+    statuses = list(SignalStatus)
+    for i in range(SEED_ROWS):
+        # Pairs of rows share a timestamp so the keyset id tie-breaker is exercised
+        ts = now - timedelta(minutes=30 * (i // 2))
+        db.add(TradingSignal(
+            timestamp=ts,
+            symbol="GBP/USD" if i % 2 else "GOLD",
+            direction="BUY" if i % 3 else "SELL",
+            entry=1.2650,
+            stop_loss=1.2600,
+            tp1=1.2750,
+            status=statuses[i % len(statuses)],
+            actual_pnl=float(i % 5 - 2),
+        ))
+        db.add(JournalEntry(
+            open_time=ts,
+            symbol="GBPUSD",
+            trade_type=TradeType.BUY,
+            lots=0.1,
+            entry_price=1.2650,
+            profit_loss=float(i % 5 - 2),
+            outcome=TradeOutcomeJournal.WIN if i % 2 else TradeOutcomeJournal.LOSS,
+        ))
+    db.commit()
+    db.close()
+    return TestClient(api.app)
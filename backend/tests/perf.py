@@ -0,0 +1,30 @@
+"""
+Query-count instrumentation for endpoint performance tests
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+
+
+@contextmanager
+def count_queries(conn) -> Iterator[List[str]]:
+    """
+    Record every SQL statement executed on `conn` (an Engine or Connection)
+    while the block runs.
+
+    Usage:
+        with count_queries(engine) as queries:
+            client.get("/signals")
+        assert len(queries) <= 2
+    """
+    queries: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(conn, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,42 @@
+"""
+Keyset pagination for the list endpoints
+Walks every page via next_cursor and checks nothing is skipped or repeated.
+
+Run from the backend folder: python -m pytest tests/test_pagination.py
+"""
+import pytest
+
+import app as api
+from database.signal_models import TradingSignal
+from database.journal_models import JournalEntry
+
+
+def _walk(client, path, key, page_size):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        body = client.get(path, params=params).json()
+        assert len(body[key]) <= page_size
+        seen.extend(body[key])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("path,key,model", [
+    ("/api/signals", "signals", TradingSignal),
+    ("/api/journal/entries", "entries", JournalEntry),
+])
+def test_cursor_walk_returns_every_row_once(client, path, key, model):
+    db = api.SessionLocal()
+    total = db.query(model).count()
+    db.close()
+
+    rows = _walk(client, path, key, page_size=7)
+    ids = [r["id"] for r in rows]
+
+    assert len(ids) == total
+    assert len(set(ids)) == total
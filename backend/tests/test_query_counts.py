@@ -0,0 +1,30 @@
+"""
+Query-count budgets for the list endpoints
+Fails when a handler starts issuing per-row (N+1) queries.
+
+Run from the backend folder: python -m pytest tests/test_query_counts.py
+"""
+import pytest
+
+import app as api
+from perf import count_queries
+
+# endpoint -> maximum number of SQL statements per request
+QUERY_BUDGETS = {
+    "/signals": 2,
+    "/api/signals": 2,
+    "/api/signals/today": 2,
+    "/api/signals/statistics": 2,
+    "/api/signals/performance": 2,
+    "/api/signals/pending": 2,
+    "/api/journal/entries": 2,
+}
+
+
+@pytest.mark.parametrize("path,budget", sorted(QUERY_BUDGETS.items()))
+def test_list_endpoint_query_budget(client, path, budget):
+    with count_queries(api.engine) as queries:
+        response = client.get(path)
+
+    assert response.status_code == 200
+    assert len(queries) <= budget, f"{path} issued {len(queries)} queries:\n" + "\n".join(queries)
@@ -0,0 +1,83 @@
+"""
+OANDA Candle Helpers
+
+Shared by the live multi-timeframe engine, the backtest engine and the
+DataManager utility so all three size their requests and parse candles
+the same way.
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# Bar length per OANDA granularity, used to size candle request windows
+GRANULARITY_MINUTES = {
+    'M1': 1,
+    'M5': 5,
+    'M15': 15,
+    'M30': 30,
+    'H1': 60,
+    'H4': 240,
+    'D': 1440,
+}
+
+
+def candles_to_frame(candles: List[Dict[str, Any]], strict_mid: bool = True) -> pd.DataFrame:
+    """
+    Convert OANDA candles to an OHLCV DataFrame indexed by timestamp.
+
+    Incomplete candles are skipped. The raw fields are collected column-wise
+    and each column is converted in one go.
+
+    Args:
+        candles: List of candle dicts from OANDA
+        strict_mid: Candles were requested with price="M", so every one has a
+                    'mid' block and a volume. Pass False to tolerate partial
+                    payloads, with missing prices/volume read as 0.
+
+    Returns:
+        DataFrame: open/high/low/close/volume sorted by time (empty if no
+        complete candles)
+    """
+    times, opens, highs, lows, closes, volumes = [], [], [], [], [], []
+
+    for candle in candles:
+        if not candle.get('complete', False):
+            continue
+
+        times.append(candle['time'][:19])  # drop the '.000000000Z' suffix
+        if strict_mid:
+            mid = candle['mid']
+            opens.append(mid['o'])
+            highs.append(mid['h'])
+            lows.append(mid['l'])
+            closes.append(mid['c'])
+            volumes.append(candle['volume'])
+        else:
+            mid = candle.get('mid', {})
+            opens.append(mid.get('o', 0))
+            highs.append(mid.get('h', 0))
+            lows.append(mid.get('l', 0))
+            closes.append(mid.get('c', 0))
+            volumes.append(candle.get('volume', 0))
+
+    if not times:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(
+        {
+            'open': np.asarray(opens, dtype=np.float64),
+            'high': np.asarray(highs, dtype=np.float64),
+            'low': np.asarray(lows, dtype=np.float64),
+            'close': np.asarray(closes, dtype=np.float64),
+            'volume': np.asarray(volumes, dtype=np.int64)
+        },
+        index=pd.DatetimeIndex(
+            pd.to_datetime(times, format='%Y-%m-%dT%H:%M:%S', cache=True),
+            name='timestamp'
+        )
+    )
+    df.sort_index(inplace=True)
+
+    return df
@@ -0,0 +1,35 @@
+"""
+ORJSON Response Class
+
+Serializes API responses with orjson (Rust core) instead of stdlib json.
+Handles numpy scalars/arrays and non-string dict keys natively, so
+handlers can return pandas/numpy-derived values without converting them.
+ORM rows with a to_dict() method can be returned as-is: orjson calls
+back into them one at a time instead of a handler building a full
+list of dicts first.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Serialize model instances (TradingSignal, JournalEntry, ...) via to_dict()"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return to_dict()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
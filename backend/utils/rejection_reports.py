@@ -0,0 +1,74 @@
+"""
+Rejected-Signal Report Helpers
+
+Shared by the report producer (scripts/report_rejected_signals.py) and the
+/api/rejections endpoint so both flatten reports into the same CSV layout.
+"""
+import csv
+import io
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+
+REJECTION_CSV_HEADER = [
+    "date", "hour", "timestamp", "instrument", "regime", "reason",
+    "strength", "agreement", "buy_votes", "sell_votes", "confidence",
+    "atr_pct", "adx", "volatility_ok", "strength_ok", "adx_ok",
+    "last_price", "suggested_direction", "proposed_entry",
+    "proposed_stop_loss", "proposed_take_profit"
+]
+
+
+def rejection_csv_rows(data: Dict[str, Any], target_date: str) -> Iterator[bytes]:
+    """Yield a rejection report as CSV one encoded row at a time"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def flush() -> bytes:
+        chunk = buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+        return chunk
+
+    writer.writerow(REJECTION_CSV_HEADER)
+    yield flush()
+    report_date = data.get("date", target_date)
+    for r in data.get("rejections", []):
+        m = r.get("metrics", {})
+        writer.writerow([
+            report_date,
+            r.get("hour"),
+            r.get("timestamp"),
+            r.get("instrument"),
+            r.get("regime"),
+            r.get("reason"),
+            m.get("strength"),
+            m.get("agreement"),
+            m.get("buy_votes"),
+            m.get("sell_votes"),
+            m.get("confidence"),
+            m.get("atr_pct"),
+            m.get("adx"),
+            m.get("volatility_ok"),
+            m.get("strength_ok"),
+            m.get("adx_ok"),
+            m.get("last_price"),
+            m.get("suggested_direction"),
+            m.get("proposed_entry"),
+            m.get("proposed_stop_loss"),
+            m.get("proposed_take_profit"),
+        ])
+        yield flush()
+
+
+def write_csv_sidecar(report_path: Path, data: Dict[str, Any]) -> Path:
+    """
+    Write the CSV form of a report next to its JSON file
+    (rejected_signals_YYYY-MM-DD.csv) so the API can send it as-is.
+    """
+    csv_path = report_path.with_suffix(".csv")
+    target_date = report_path.stem.split("_")[-1]
+    with open(csv_path, "wb") as f:
+        for chunk in rejection_csv_rows(data, target_date):
+            f.write(chunk)
+    return csv_path
@@ -34,9 +34,17 @@ const Journal = () => {
 
   const loadJournalEntries = async () => {
     try {
-      const response = await fetch('http://localhost:5000/api/journal/entries');
-      const data = await response.json();
-      setRowData(data.entries || []);
+      // Entries are paginated - follow next_cursor until every page is loaded
+      const entries = [];
+      let cursor = null;
+      do {
+        const query = cursor === null ? '' : `?cursor=${cursor}`;
+        const response = await fetch(`http://localhost:5000/api/journal/entries${query}`);
+        const data = await response.json();
+        entries.push(...(data.entries || []));
+        cursor = data.next_cursor ?? null;
+      } while (cursor !== null);
+      setRowData(entries);
     } catch (error) {
       console.error('Failed to load journal entries:', error);
     }